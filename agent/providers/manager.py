@@ -163,9 +163,10 @@ class ProviderManager:
         self,
         resource_id: str,
         action: str,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None
     ) -> ActionResult:
-        """Execute an action on a resource."""
+        """Execute an action on a resource, giving up after timeout seconds if set."""
         resource = self._resources.get(resource_id)
         if not resource and resource_id.endswith(".service"):
             provider = self._providers.get("systemd")
@@ -199,7 +200,17 @@ class ProviderManager:
         
         # Execute action
         logger.info("Executing action", resource_id=resource_id, action=action)
-        result = await provider.execute_action(resource_id, action, params)
+        try:
+            result = await asyncio.wait_for(
+                provider.execute_action(resource_id, action, params), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Action timed out", resource_id=resource_id, action=action, timeout=timeout)
+            return ActionResult(
+                success=False,
+                message=f"Action '{action}' timed out after {timeout:g}s",
+                error="TIMEOUT"
+            )
 
         if resource.provider == "systemd" and result.success:
             refreshed = await provider.get_resource(resource_id)
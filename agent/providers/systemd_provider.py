@@ -52,7 +52,13 @@ class SystemdProvider(BaseProvider):
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
-            stdout, stderr = await process.communicate()
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                # Cancelled by an action timeout: don't leave systemctl behind
+                if process.returncode is None:
+                    process.kill()
+                raise
             
             return {
                 "returncode": process.returncode,
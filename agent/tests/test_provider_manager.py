@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -114,6 +115,25 @@ async def test_execute_action_resolves_uncached_systemd_and_refreshes_state():
     assert manager._resources[old.id].state is ResourceState.STOPPED
 
 
+@pytest.mark.asyncio
+async def test_execute_action_times_out_with_structured_error():
+    resource = _resource()
+    provider = _provider()
+
+    async def hang(*args):
+        await asyncio.sleep(10)
+
+    provider.execute_action = AsyncMock(side_effect=hang)
+    manager = ProviderManager({})
+    manager._resources[resource.id] = resource
+    manager._providers["systemd"] = provider
+
+    result = await manager.execute_action(resource.id, "start", timeout=0.01)
+
+    assert result.success is False
+    assert result.error == "TIMEOUT"
+
+
 @pytest.mark.asyncio
 async def test_logs_stats_and_dependencies_delegate_to_owner():
     resource = _resource()
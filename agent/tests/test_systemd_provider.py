@@ -1,5 +1,6 @@
+import asyncio
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -81,6 +82,28 @@ async def test_actions_success_unknown_and_systemctl_failure():
     assert (await provider.execute_action("missing.service", "start")).error == "NOT_FOUND"
 
 
+@pytest.mark.asyncio
+async def test_cancelled_command_kills_the_child(monkeypatch):
+    started = asyncio.Event()
+
+    async def communicate():
+        started.set()
+        await asyncio.sleep(10)
+
+    process = MagicMock(returncode=None, communicate=communicate)
+    monkeypatch.setattr(
+        asyncio, "create_subprocess_exec", AsyncMock(return_value=process)
+    )
+    provider = SystemdProvider({})
+    task = asyncio.create_task(provider._run_command(["systemctl", "start", "app.service"]))
+    await started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    process.kill.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_logs_stats_and_dependency_graph():
     provider = SystemdProvider({})
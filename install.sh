@@ -405,7 +405,7 @@ Environment=AGENT_SOCKET=/run/pi-agent/agent.sock
 Environment=JWT_SECRET_FILE=/etc/pi-control/jwt_secret
 Environment=API_DEBUG=false
 EnvironmentFile=-$SERVICE_ENV_FILE
-ExecStart=/opt/pi-control/current/venv/bin/uvicorn main:app --host 127.0.0.1 --port 8080
+ExecStart=/opt/pi-control/current/venv/bin/uvicorn main:app --host 127.0.0.1 --port 8080 --ws-per-message-deflate false
 Restart=always
 RestartSec=5
 TimeoutStopSec=5
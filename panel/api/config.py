@@ -38,6 +38,9 @@ class Settings(BaseSettings):
     
     # Agent
     agent_socket: str = Field(default="/run/pi-agent/agent.sock", alias="AGENT_SOCKET")
+
+    # Resources
+    resource_cache_ttl_sec: float = Field(default=5.0, alias="RESOURCE_CACHE_TTL_SEC")
     
     # Security
     panel_allow_lan: bool = Field(default=False, alias="PANEL_ALLOW_LAN")
@@ -4,6 +4,7 @@ Pi Control Panel - Database Module
 SQLite database initialization and utilities.
 """
 
+import asyncio
 import aiosqlite
 import structlog
 import os
@@ -39,6 +40,9 @@ async def init_db():
     await _control_db.execute("PRAGMA busy_timeout=5000")
     await _control_db.execute("PRAGMA journal_mode=WAL")
     await _control_db.execute("PRAGMA synchronous=NORMAL")
+    await _control_db.execute("PRAGMA temp_store=MEMORY")
+    await _control_db.execute("PRAGMA cache_size=-65536")
+    await _control_db.execute("PRAGMA mmap_size=268435456")
     await _init_control_schema(_control_db)
     _secure_database_file(settings.database_path)
     logger.info("Control database initialized", path=settings.database_path)
@@ -49,6 +53,10 @@ async def init_db():
     await _telemetry_db.execute("PRAGMA busy_timeout=5000")
     await _telemetry_db.execute("PRAGMA journal_mode=WAL")
     await _telemetry_db.execute("PRAGMA synchronous=NORMAL")
+    # Metric range scans are read-heavy; keep hot index pages in memory
+    await _telemetry_db.execute("PRAGMA temp_store=MEMORY")
+    await _telemetry_db.execute("PRAGMA cache_size=-65536")
+    await _telemetry_db.execute("PRAGMA mmap_size=268435456")
     await _init_telemetry_schema(_telemetry_db)
     _secure_database_file(settings.telemetry_db_path)
     logger.info("Telemetry database initialized", path=settings.telemetry_db_path)
@@ -59,6 +67,8 @@ async def close_db():
     global _control_db, _telemetry_db
     
     if _control_db:
+        # Let SQLite refresh planner statistics for the resource indexes
+        await _control_db.execute("PRAGMA optimize")
         await _control_db.close()
         _control_db = None
     
@@ -94,6 +104,26 @@ async def get_telemetry_db():
     return _telemetry_db
 
 
+async def delete_in_batches(db, table: str, where: str, params: tuple, batch_size: int = 10000) -> int:
+    """Delete rows matching `where`, one committed batch at a time.
+
+    Each batch is its own short write transaction, so telemetry inserts can
+    interleave with a large retention delete instead of waiting behind it.
+    """
+    deleted = 0
+    while True:
+        cursor = await db.execute(
+            f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} WHERE {where} LIMIT ?)",
+            (*params, batch_size),
+        )
+        await db.commit()
+        batch = cursor.rowcount or 0
+        deleted += batch
+        if batch < batch_size:
+            return deleted
+        await asyncio.sleep(0)
+
+
 async def _init_control_schema(db):
     """Initialize control database schema."""
     
@@ -341,6 +371,11 @@ async def _init_control_schema(db):
     await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)")
     await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_family ON sessions(family_id)")
     await db.execute("CREATE INDEX IF NOT EXISTS idx_resources_provider ON resources(provider)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_resources_name ON resources(name)")
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_resources_unmanaged_discovered "
+        "ON resources(discovered_at DESC) WHERE managed = 0"
+    )
     await db.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_user ON audit_log(user_id)")
     await db.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_created ON audit_log(created_at)")
     await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state)")
@@ -412,7 +447,9 @@ async def _init_telemetry_schema(db):
     """)
     
     # Create indexes
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_metrics_raw_lookup ON metrics_raw(metric, ts)")
+    # Covering index: metric/range queries read ts and value without touching the table
+    await db.execute("DROP INDEX IF EXISTS idx_metrics_raw_lookup")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_metrics_raw_metric_ts ON metrics_raw(metric, ts, value)")
     await db.execute("CREATE INDEX IF NOT EXISTS idx_metrics_raw_ts ON metrics_raw(ts)")
     await db.execute("CREATE INDEX IF NOT EXISTS idx_metrics_summary_lookup ON metrics_summary(metric, ts)")
     await db.execute("CREATE INDEX IF NOT EXISTS idx_iot_readings_device ON iot_sensor_readings(device_id, timestamp)")
@@ -420,3 +457,5 @@ async def _init_telemetry_schema(db):
     await db.execute("CREATE INDEX IF NOT EXISTS idx_iot_readings_ts ON iot_sensor_readings(timestamp)")
     
     await db.commit()
+    # Refresh planner statistics when they are stale; a no-op otherwise
+    await db.execute("PRAGMA optimize")
@@ -44,6 +44,9 @@ async def run_migrations(db_path: str):
             ("005_standard_user", migrate_005_standard_user),
             ("006_login_lockout", migrate_006_login_lockout),
             ("007_operations_foundation", migrate_007_operations_foundation),
+            ("008_resource_filter_indexes", migrate_008_resource_filter_indexes),
+            ("009_resource_name_index", migrate_009_resource_name_index),
+            ("010_drop_resource_filter_index", migrate_010_drop_resource_filter_index),
         ]
         
         # Apply pending migrations
@@ -443,6 +446,37 @@ async def migrate_007_operations_foundation(db):
     )
 
 
+async def migrate_008_resource_filter_indexes(db):
+    """Indexes backing the resource list filters and the discovery queue."""
+    await db.executescript(
+        """
+        CREATE INDEX IF NOT EXISTS idx_resources_provider_class_managed_name
+            ON resources(provider, class, managed, name);
+        CREATE INDEX IF NOT EXISTS idx_resources_unmanaged_discovered
+            ON resources(discovered_at DESC) WHERE managed = 0;
+        """
+    )
+
+
+async def migrate_009_resource_name_index(db):
+    """Name-ordered index for the fixed-shape resource list query.
+
+    Its optional filters are written as (:x IS NULL OR col = :x), which the
+    planner cannot turn into index lookups; walking this index instead avoids
+    a temp B-tree sort for ORDER BY name.
+    """
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_resources_name ON resources(name)")
+
+
+async def migrate_010_drop_resource_filter_index(db):
+    """Drop the composite filter index from 008.
+
+    The list query's (:x IS NULL OR col = :x) filters cannot use it, so it
+    only cost writes; idx_resources_name serves that query instead.
+    """
+    await db.execute("DROP INDEX IF EXISTS idx_resources_provider_class_managed_name")
+
+
 if __name__ == "__main__":
     import sys
     db_path = sys.argv[1] if len(sys.argv) > 1 else "/data/control.db"
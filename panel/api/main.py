@@ -8,7 +8,10 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from collections import defaultdict, deque
 import ipaddress
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import os
+import queue
 from time import monotonic
 
 import structlog
@@ -32,6 +35,8 @@ from services.job_scheduler import job_scheduler
 from services.resource_event_bridge import resource_event_bridge
 from services.notification_service import notification_service
 from services.audit_chain import audit_chain_service
+from services.audit_writer import audit_writer
+from services.process_sampler import process_sampler
 
 # ... existing code ...
 
@@ -85,10 +90,23 @@ def _check_rate_limit(key: str, limit: int, window_seconds: int = 60) -> bool:
     return True
 
 
+def _start_log_listener() -> QueueListener:
+    """Hand root log records to a background thread so writes never block the event loop."""
+    root = logging.getLogger()
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
+    root_log_handlers = logging.getLogger().handlers[:]
+    log_listener = _start_log_listener()
     logger.info("Starting Pi Control Panel API", version="1.0.0")
     
     # Refresh paths before migrations so test/reload environments cannot migrate
@@ -114,12 +132,16 @@ async def lifespan(app: FastAPI):
     await job_scheduler.start()
     await resource_event_bridge.start()
     await notification_service.start()
+    await audit_writer.start()
+    await process_sampler.start()
     await audit_chain_service.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down Pi Control Panel API")
+    await process_sampler.stop()
+    await audit_writer.stop()
     await audit_chain_service.stop()
     await notification_service.stop()
     await resource_event_bridge.stop()
@@ -130,6 +152,8 @@ async def lifespan(app: FastAPI):
     await alert_manager.stop()
     await agent_client.disconnect()
     await close_db()
+    log_listener.stop()
+    logging.getLogger().handlers = root_log_handlers
 
 
 # Create FastAPI app
@@ -262,7 +286,9 @@ if __name__ == "__main__":
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=settings.api_debug
+        reload=settings.api_debug,
+        # Matches the service unit: terminal output is not deflated per socket
+        ws_per_message_deflate=False,
     )
 
 
@@ -14,6 +14,7 @@ from pydantic import BaseModel
 
 from db import get_control_db
 from services.sse import sse_manager, Channels
+from services.dashboard_counts import dashboard_counts
 from .auth import get_current_user, require_role
 from time_utils import utc_now
 
@@ -211,6 +212,7 @@ async def delete_alert_rule(
         raise HTTPException(status_code=404, detail="Rule not found")
     
     await db.commit()
+    dashboard_counts.invalidate()
     
     return {"message": f"Rule {rule_id} deleted"}
 
@@ -320,6 +322,7 @@ async def acknowledge_alert(
     )
     
     await db.commit()
+    dashboard_counts.invalidate()
     
     # Broadcast
     await sse_manager.broadcast(Channels.ALERTS, "alert_acknowledged", {
@@ -372,6 +375,7 @@ async def resolve_alert(
     )
     
     await db.commit()
+    dashboard_counts.invalidate()
     
     # Broadcast
     await sse_manager.broadcast(Channels.ALERTS, "alert_resolved", {"alert_id": alert_id})
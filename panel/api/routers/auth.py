@@ -416,12 +416,11 @@ async def logout(request: Request, response: Response, user: dict = Depends(get_
                WHERE user_id=? AND refresh_token_hash=?""",
             (user["id"], hash_refresh_token(refresh_token)),
         )
-    await db.commit()
     
     # Clear cookie
     response.delete_cookie("refresh_token")
     
-    # Audit log
+    # Audit log (same transaction as the revocation)
     await db.execute(
         "INSERT INTO audit_log (user_id, action) VALUES (?, ?)",
         (user["id"], "logout")
@@ -503,11 +502,9 @@ async def create_user(
         "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
         (user_data.username, password_hash, user_data.role)
     )
-    await db.commit()
-    
     user_id = cursor.lastrowid
     
-    # Audit log
+    # Audit log (same transaction as the insert: one commit)
     await db.execute(
         "INSERT INTO audit_log (user_id, action, details) VALUES (?, ?, ?)",
         (current_user["id"], "create_user", f"Created user: {user_data.username}")
@@ -559,9 +556,8 @@ async def delete_user(user_id: int, current_user: dict = Depends(require_role("a
         raise HTTPException(status_code=400, detail="Cannot delete superadmin")
     
     await db.execute("DELETE FROM users WHERE id = ?", (user_id,))
-    await db.commit()
     
-    # Audit log
+    # Audit log (same transaction as the delete)
     await db.execute(
         "INSERT INTO audit_log (user_id, action, details) VALUES (?, ?, ?)",
         (current_user["id"], "delete_user", f"Deleted user: {target_username}")
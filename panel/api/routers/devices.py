@@ -6,6 +6,7 @@ Handles hardware device management (USB, serial, GPIO, ESP via MQTT).
 
 import asyncio
 import json
+import re
 from time import monotonic
 from typing import List, Optional, Dict
 
@@ -139,7 +140,7 @@ def _invalidate_device_cache() -> None:
 
 async def _local_device_discovery() -> List[DeviceResponse]:
     """Discover devices from HOST system via SSH - OPTIMIZED single call."""
-    from services.host_exec import run_host_command_simple
+    from services.host_exec import run_host_command_async
     import json as json_lib
     
     devices = []
@@ -148,7 +149,7 @@ async def _local_device_discovery() -> List[DeviceResponse]:
     combined_cmd = "echo '===USB==='; lsusb 2>/dev/null; echo '===BLK==='; lsblk -J -o NAME,SIZE,TYPE,MODEL,TRAN 2>/dev/null; echo '===SER==='; ls /dev/ttyUSB* /dev/ttyACM* 2>/dev/null || true; echo '===END==='"
     
     try:
-        output = run_host_command_simple(combined_cmd, timeout=10)
+        output = await run_host_command_async(combined_cmd, timeout=10)
         if not output:
             return []
         
@@ -590,13 +591,12 @@ async def mute_esp_device(
 
 async def _get_local_gpio_status():
     """Get status of all GPIO pins using raspi-gpio."""
-    from services.host_exec import run_host_command_simple
-    import re
+    from services.host_exec import run_host_command_async
     
     # Try raspi-gpio first (common on Pi OS)
     # If not available, we return empty list to avoid crashing or lying
     try:
-        output = run_host_command_simple("raspi-gpio get", timeout=2)
+        output = await run_host_command_async("raspi-gpio get", timeout=2)
         if not output or "command not found" in output:
              # Fallback to reading /sys/class/gpio or pinctrl if needed
              # For now, return empty or a minimal set if tool missing
@@ -650,7 +650,7 @@ async def configure_gpio(
     user: dict = Depends(require_role("admin"))
 ):
     """Configure a GPIO pin."""
-    from services.host_exec import run_host_command_simple
+    from services.host_exec import run_host_command_async
     
     db = await get_control_db()
     
@@ -673,7 +673,7 @@ async def configure_gpio(
     elif config.pull == "down":
         cmd += " pd"
         
-    run_host_command_simple(cmd)
+    await run_host_command_async(cmd)
     
     return {"message": f"GPIO pin {config.pin} configured"}
 
@@ -685,11 +685,11 @@ async def write_gpio(
     user: dict = Depends(require_role("admin", "operator"))
 ):
     """Write value to a GPIO output pin."""
-    from services.host_exec import run_host_command_simple
+    from services.host_exec import run_host_command_async
     
     # raspi-gpio set <pin> dh (high) or dl (low)
     state = "dh" if value == 1 else "dl"
-    run_host_command_simple(f"raspi-gpio set {pin} {state}")
+    await run_host_command_async(f"raspi-gpio set {pin} {state}")
     
     return {"message": f"GPIO {pin} set to {value}"}
 
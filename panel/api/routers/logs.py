@@ -4,10 +4,14 @@ Pi Control Panel - Logs Router
 Handles log retrieval, search, and streaming.
 """
 
-from typing import List, Optional
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import re
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
 
@@ -18,6 +22,15 @@ from time_utils import utc_now
 
 router = APIRouter()
 
+# ISO timestamp with level in brackets: timestamp [LEVEL] message
+_ISO_LOG_RE = re.compile(
+    r'^(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\s*\[?(\w+)\]?\s*(.*)$'
+)
+# Syslog format: Mon DD HH:MM:SS hostname service: message
+_SYSLOG_RE = re.compile(r'^(\w{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})\s+(\S+)\s+(\S+):\s*(.*)$')
+_MAX_SEARCH_TERMS = 10
+_MAX_LOG_FETCH = 10000
+
 
 class LogLine(BaseModel):
     timestamp: str
@@ -26,6 +39,23 @@ class LogLine(BaseModel):
     source: Optional[str] = None
 
 
+@dataclass(slots=True)
+class _ParsedLogLine:
+    """Internal parse result; converted to LogLine only when returned."""
+    timestamp: str
+    level: str
+    message: str
+    source: Optional[str] = None
+
+    def to_model(self) -> LogLine:
+        return LogLine(
+            timestamp=self.timestamp,
+            level=self.level,
+            message=self.message,
+            source=self.source,
+        )
+
+
 class LogsResponse(BaseModel):
     resource_id: str
     lines: List[LogLine]
@@ -48,33 +78,47 @@ async def get_logs(
     level: Optional[str] = Query(None, description="Filter by level (error, warning, info)"),
     user: dict = Depends(get_current_user)
 ):
-    """Get logs for a resource."""
-    try:
-        raw_logs = await agent_client.get_resource_logs(resource_id, tail)
-    except Exception:
-        # Return mock data if agent unavailable
-        raw_logs = [
-            "2024-01-15T10:30:00Z [INFO] Container started",
-            "2024-01-15T10:30:05Z [INFO] Health check passed",
-            "2024-01-15T10:30:10Z [DEBUG] Processing request",
-        ]
+    """Get logs for a resource.
+
+    ``tail`` applies to the filtered result: when a level or time filter is
+    set, progressively larger windows are fetched until ``tail`` matching
+    lines are found or the log is exhausted.
+    """
+    level_lower = level.lower() if level else None
+    since_dt = _parse_filter_time(since, "since")
+    until_dt = _parse_filter_time(until, "until")
+    filtered = bool(level_lower or since_dt or until_dt)
+    fetch = tail
     
-    # Parse log lines
-    lines = []
-    for raw_line in raw_logs:
-        parsed = _parse_log_line(raw_line)
-        
-        # Apply level filter
-        if level and parsed.level.lower() != level.lower():
-            continue
+    while True:
+        try:
+            raw_logs = await agent_client.get_resource_logs(resource_id, fetch)
+        except Exception:
+            # Return mock data if agent unavailable
+            raw_logs = [
+                "2024-01-15T10:30:00Z [INFO] Container started",
+                "2024-01-15T10:30:05Z [INFO] Health check passed",
+                "2024-01-15T10:30:10Z [DEBUG] Processing request",
+            ]
         
-        # Apply timestamp filters
-        if since and parsed.timestamp < since:
-            continue
-        if until and parsed.timestamp > until:
-            continue
+        # Parse and filter in a single pass
+        lines = [
+            parsed for raw_line in raw_logs
+            if (parsed := _parse_log_line(raw_line))
+            and (not level_lower or parsed.level.lower() == level_lower)
+            and _within(parsed.timestamp, since_dt, until_dt)
+        ]
         
-        lines.append(parsed)
+        if (
+            not filtered
+            or len(lines) >= tail
+            or len(raw_logs) < fetch
+            or fetch >= _MAX_LOG_FETCH
+        ):
+            break
+        fetch = min(fetch * 4, _MAX_LOG_FETCH)
+    
+    lines = [parsed.to_model() for parsed in lines[-tail:]]
     
     return LogsResponse(
         resource_id=resource_id,
@@ -86,7 +130,8 @@ async def get_logs(
 @router.get("/{resource_id}/search", response_model=List[SearchResult])
 async def search_logs(
     resource_id: str,
-    query: str = Query(..., min_length=1, max_length=100),
+    query: str = Query(..., min_length=1, max_length=100, description="Search text, matched literally"),
+    any_term: bool = Query(False, description="Split query on | and match any of the terms"),
     since: Optional[str] = Query(None),
     until: Optional[str] = Query(None),
     context_lines: int = Query(2, ge=0, le=10),
@@ -94,32 +139,33 @@ async def search_logs(
     user: dict = Depends(get_current_user)
 ):
     """Search logs for a resource."""
+    matcher = _compile_search(query, any_term)
+    
     try:
         raw_logs = await agent_client.get_resource_logs(resource_id, 5000)
     except Exception:
         raw_logs = []
     
     results = []
-    query_lower = query.lower()
     
     for i, raw_line in enumerate(raw_logs):
-        if query_lower in raw_line.lower():
-            parsed = _parse_log_line(raw_line)
-            
-            # Get context lines
-            start = max(0, i - context_lines)
-            end = min(len(raw_logs), i + context_lines + 1)
-            context = raw_logs[start:end]
-            
-            results.append(SearchResult(
-                line_number=i,
-                timestamp=parsed.timestamp,
-                content=raw_line,
-                context=context
-            ))
-            
-            if len(results) >= max_results:
-                break
+        if not matcher.search(raw_line):
+            continue
+        parsed = _parse_log_line(raw_line)
+        
+        # Get context lines
+        start = max(0, i - context_lines)
+        end = min(len(raw_logs), i + context_lines + 1)
+        
+        results.append(SearchResult(
+            line_number=i,
+            timestamp=parsed.timestamp,
+            content=raw_line,
+            context=raw_logs[start:end]
+        ))
+        
+        if len(results) >= max_results:
+            break
     
     return results
 
@@ -173,7 +219,7 @@ async def tail_logs(
     
     return {
         "resource_id": resource_id,
-        "lines": [line.model_dump() for line in parsed_lines],
+        "lines": [asdict(line) for line in parsed_lines],
         "count": len(parsed_lines)
     }
 
@@ -205,34 +251,105 @@ async def log_stats(
     }
 
 
-def _parse_log_line(raw_line: str) -> LogLine:
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_filter_time(value: Optional[str], name: str) -> Optional[datetime]:
+    """Parse a since/until query value once per request (naive UTC)."""
+    if not value:
+        return None
+    try:
+        return _to_naive_utc(datetime.fromisoformat(value))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp") from e
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> Tuple[Optional[datetime], bool]:
+    """Memoized year-independent parse of a log line timestamp.
+
+    ISO timestamps come back as naive UTC. Syslog ones carry neither year
+    nor zone, so they come back as local wall time in leap year 2000 (so
+    Feb 29 parses), flagged True for _log_timestamp to finish.
+    """
+    try:
+        return _to_naive_utc(datetime.fromisoformat(value)), False
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(f"2000 {value}", "%Y %b %d %H:%M:%S"), True
+    except ValueError:
+        return None, False
+
+
+def _log_timestamp(value: str) -> Optional[datetime]:
+    """Parse a log line timestamp (ISO or syslog) to naive UTC."""
+    parsed, is_syslog = _parse_timestamp(value)
+    if not is_syslog:
+        return parsed
+    try:
+        # Syslog stamps are local time in the current local year
+        local = parsed.replace(year=datetime.now().year)
+    except ValueError:
+        # Feb 29 outside a leap year
+        return None
+    return _to_naive_utc(local.astimezone())
+
+
+def _within(timestamp: str, since: Optional[datetime], until: Optional[datetime]) -> bool:
+    if since is None and until is None:
+        return True
+    parsed = _log_timestamp(timestamp)
+    if parsed is None:
+        return False
+    if since is not None and parsed < since:
+        return False
+    if until is not None and parsed > until:
+        return False
+    return True
+
+
+def _compile_search(query: str, any_term: bool = False) -> re.Pattern:
+    """Compile a case-insensitive literal matcher for a search query.
+
+    The query is one literal string, pipes included. With any_term it is
+    split on | and each escaped term becomes one alternative, so all terms
+    are matched in a single pass over each line.
+    """
+    if not any_term:
+        return re.compile(re.escape(query), re.IGNORECASE)
+    terms = {term.strip() for term in query.split("|") if term.strip()}
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query is empty")
+    if len(terms) > _MAX_SEARCH_TERMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {_MAX_SEARCH_TERMS} search terms are allowed",
+        )
+    # Longest first so overlapping alternatives prefer the more specific term
+    ordered = sorted(terms, key=len, reverse=True)
+    return re.compile("|".join(re.escape(term) for term in ordered), re.IGNORECASE)
+
+
+def _parse_log_line(raw_line: str) -> _ParsedLogLine:
     """Parse a raw log line into structured format."""
     # Try common log formats
-    
-    # Common format: timestamp [LEVEL] message
-    import re
-    
-    # ISO timestamp with level in brackets
-    match = re.match(
-        r'^(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\s*\[?(\w+)\]?\s*(.*)$',
-        raw_line
-    )
+    match = _ISO_LOG_RE.match(raw_line)
     
     if match:
-        return LogLine(
+        return _ParsedLogLine(
             timestamp=match.group(1),
             level=match.group(2).upper(),
             message=match.group(3)
         )
     
-    # Syslog format: Mon DD HH:MM:SS hostname service: message
-    match = re.match(
-        r'^(\w{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})\s+(\S+)\s+(\S+):\s*(.*)$',
-        raw_line
-    )
+    match = _SYSLOG_RE.match(raw_line)
     
     if match:
-        return LogLine(
+        return _ParsedLogLine(
             timestamp=match.group(1),
             level="INFO",
             message=match.group(4),
@@ -240,7 +357,7 @@ def _parse_log_line(raw_line: str) -> LogLine:
         )
     
     # Fallback: unknown format
-    return LogLine(
+    return _ParsedLogLine(
         timestamp=utc_now().isoformat(),
         level="INFO",
         message=raw_line
@@ -12,6 +12,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from db import get_control_db
+from services.dashboard_counts import dashboard_counts
 from .auth import get_current_user, require_role
 from time_utils import utc_now
 
@@ -118,6 +119,7 @@ async def create_manifest(
     )
     
     await db.commit()
+    dashboard_counts.invalidate()
     
     return ManifestResponse(
         id=manifest_id,
@@ -4,7 +4,12 @@ Pi Control Panel - Network Router
 Handles network interface management, WiFi configuration, and connectivity.
 """
 
+import asyncio
+import ipaddress
+import json
 import re
+import socket
+import struct
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query, HTTPException
@@ -92,89 +97,113 @@ async def list_interfaces(user: dict = Depends(get_current_user)):
     return await _get_local_interfaces()
 
 
+async def _run_ip_json(*args: str) -> list:
+    """Run ``ip -j`` with the given arguments and decode its JSON output."""
+    proc = await asyncio.create_subprocess_exec(
+        "ip", "-j", *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=2)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return []
+    if proc.returncode != 0 or not stdout.strip():
+        return []
+    return json.loads(stdout)
+
+
+def _read_default_gateways() -> dict:
+    """Map interface name to its IPv4 default gateway from /proc/net/route.
+
+    Reads the kernel routing table directly instead of forking ``ip route``.
+    """
+    gateways = {}
+    try:
+        with open("/proc/net/route", "r") as f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 4 or fields[1] != "00000000":
+                    continue
+                if not int(fields[3], 16) & 0x2:  # RTF_GATEWAY
+                    continue
+                # The kernel prints the address as a host-order integer
+                gateway = socket.inet_ntoa(struct.pack("=L", int(fields[2], 16)))
+                # First default route per device wins, matching `ip route` ordering
+                gateways.setdefault(fields[0], gateway)
+    except (OSError, ValueError):
+        pass
+    return gateways
+
+
+def _read_link_speed(iface_name: str) -> Optional[int]:
+    """Read the negotiated link speed in Mbps from sysfs, if known."""
+    try:
+        with open(f"/sys/class/net/{iface_name}/speed", "r") as f:
+            speed = int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+    return speed if speed > 0 else None
+
+
+def _interface_type(iface_name: str) -> str:
+    if iface_name.startswith("wlan") or iface_name.startswith("wl"):
+        return "wifi"
+    elif iface_name.startswith("tailscale") or iface_name.startswith("ts"):
+        return "vpn"
+    elif iface_name.startswith("br-"):
+        return "bridge"
+    elif iface_name.startswith("veth"):
+        return "virtual"
+    return "ethernet"
+
+
 async def _get_local_interfaces() -> List[InterfaceResponse]:
-    """Get network interfaces using psutil."""
+    """Get network interfaces from ``ip -j`` and the kernel routing table."""
     try:
-        import psutil
-        import socket
-    except ImportError:
+        links = await _run_ip_json("-s", "addr", "show")
+    except (OSError, ValueError):
         return []
-    
+
+    gateways = _read_default_gateways()
     interfaces = []
-    
-    # Get interface addresses
-    addrs = psutil.net_if_addrs()
-    stats = psutil.net_if_stats()
-    io_counters = psutil.net_io_counters(pernic=True)
-    
-    for iface_name, addr_list in addrs.items():
+
+    for link in links:
+        iface_name = link.get("ifname")
         # Skip loopback
-        if iface_name == "lo":
+        if not iface_name or iface_name == "lo":
             continue
-        
+
         ip_address = None
-        mac_address = None
         subnet_mask = None
-        
-        for addr in addr_list:
-            if addr.family == socket.AF_INET:  # IPv4
-                ip_address = addr.address
-                subnet_mask = addr.netmask
-            elif addr.family == psutil.AF_LINK:  # MAC
-                mac_address = addr.address
-        
-        # Get interface stats
-        iface_stats = stats.get(iface_name)
-        is_up = iface_stats.isup if iface_stats else False
-        speed = iface_stats.speed if iface_stats else None
-        
-        # Get IO counters
-        io = io_counters.get(iface_name)
-        rx_bytes = io.bytes_recv if io and is_up else 0
-        tx_bytes = io.bytes_sent if io and is_up else 0
-        
-        # Determine interface type
-        iface_type = "ethernet"
-        if iface_name.startswith("wlan") or iface_name.startswith("wl"):
-            iface_type = "wifi"
-        elif iface_name.startswith("tailscale") or iface_name.startswith("ts"):
-            iface_type = "vpn"
-        elif iface_name.startswith("br-"):
-            iface_type = "bridge"
-        elif iface_name.startswith("veth"):
-            iface_type = "virtual"
-        
-        # Try to get gateway for main interfaces
-        gateway = None
-        if ip_address:
-            try:
-                import subprocess
-                result = subprocess.run(
-                    ["ip", "route", "show", "default"],
-                    capture_output=True,
-                    text=True,
-                    timeout=2
-                )
-                if result.returncode == 0:
-                    for line in result.stdout.split("\n"):
-                        if iface_name in line and "via" in line:
-                            parts = line.split()
-                            gateway = parts[parts.index("via") + 1] if "via" in parts else None
-                            break
-            except Exception:
-                pass
-        
+        for addr in link.get("addr_info", []):
+            if addr.get("family") == "inet":  # IPv4
+                ip_address = addr.get("local")
+                prefixlen = addr.get("prefixlen")
+                if prefixlen is not None:
+                    subnet_mask = str(ipaddress.IPv4Network(f"0.0.0.0/{prefixlen}").netmask)
+                break
+
+        is_up = "UP" in link.get("flags", [])
+
+        stats = link.get("stats64") or link.get("stats") or {}
+        rx_bytes = stats.get("rx", {}).get("bytes", 0) if is_up else 0
+        tx_bytes = stats.get("tx", {}).get("bytes", 0) if is_up else 0
+
         interfaces.append(InterfaceResponse(
             name=iface_name,
-            type=iface_type,
+            type=_interface_type(iface_name),
             status="up" if is_up else "down",
-            mac=mac_address,
+            mac=link.get("address"),
             ip=ip_address,
             subnet_mask=subnet_mask,
-            gateway=gateway,
+            gateway=gateways.get(iface_name) if ip_address else None,
             rx_bytes=rx_bytes,
             tx_bytes=tx_bytes,
-            speed_mbps=speed if speed and speed > 0 else None
+            speed_mbps=_read_link_speed(iface_name) if is_up else None
         ))
     
     # Sort: eth first, then wlan, then others
@@ -489,3 +518,25 @@ async def get_dns_config(user: dict = Depends(get_current_user)):
         return result
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"DNS configuration unavailable: {exc}")
+
+
+@router.get("/overview")
+async def network_overview(user: dict = Depends(get_current_user)):
+    """Get WiFi, Bluetooth, connectivity and DNS status in one round-trip.
+
+    The four agent calls run concurrently; a section that fails is returned
+    as ``None`` instead of failing the whole response.
+    """
+    wifi, bluetooth, connectivity, dns = await asyncio.gather(
+        agent_client.call("network.wifi.status"),
+        agent_client.call("network.bluetooth.status"),
+        agent_client.call("network.connectivity.check"),
+        agent_client.call("network.dns.get"),
+        return_exceptions=True,
+    )
+    return {
+        "wifi": None if isinstance(wifi, Exception) else wifi,
+        "bluetooth": None if isinstance(bluetooth, Exception) else bluetooth,
+        "connectivity": None if isinstance(connectivity, Exception) else connectivity,
+        "dns": None if isinstance(dns, Exception) else dns,
+    }
@@ -5,31 +5,63 @@ Handles resource discovery, management, and actions.
 """
 
 import asyncio
+import re
 import time
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
+from config import settings
 from db import get_control_db
 from services.agent_client import agent_client
-from services.host_exec import run_host_command_simple
+from services.audit_writer import audit_writer
+from services.dashboard_counts import dashboard_counts
+from services.host_exec import is_running_in_container, run_host_command_async
+from services.process_sampler import PSUTIL_AVAILABLE, process_sampler
+from services.systemd_bus import systemd_bus
 from .auth import get_current_user, require_role
 from time_utils import utc_now
 
-router = APIRouter()
+logger = structlog.get_logger(__name__)
 
-# Service cache to avoid repeated systemctl calls (OPT-004)
-_services_cache: Tuple[List, float] = ([], 0)
-_CACHE_TTL_SECONDS = 5
+router = APIRouter(default_response_class=ORJSONResponse)
 
-CORE_SERVICES = {
+# Service cache to avoid repeated systemctl calls (OPT-004)
+_services_cache: Tuple[List, float] = ([], 0.0)
+# Bumped on invalidation so a refresh that started earlier cannot store stale data
+_services_generation = 0
+_services_refresh_lock = asyncio.Lock()
+# Serialized form of the last service list handed out: (source, dicts, JSON bytes)
+_services_payload: Tuple[Optional[List], List[dict], bytes] = (None, [], b"[]")
+
+CORE_SERVICES = frozenset({
     "caddy", "dbus", "NetworkManager", "networking", "pi-agent", "pi-control",
     "polkit", "ssh", "sshd", "systemd-journald", "systemd-logind",
     "systemd-networkd", "systemd-resolved", "tailscaled", "wpa_supplicant",
-}
-SYSTEM_SERVICES = {
+})
+SYSTEM_SERVICES = frozenset({
     "avahi-daemon", "bluetooth", "cron", "systemd-timesyncd", "systemd-udevd",
+})
+# Host command timeouts: routine listings should answer well within a few
+# seconds, and each service action gets its own ceiling. The agent enforces
+# action ceilings; the RPC's own timeout stays above them so a slow unit
+# does not drop the agent connection or trip its circuit breaker.
+LIST_TIMEOUT_S = 3
+ACTION_TIMEOUTS = {"start": 15, "stop": 15, "restart": 30, "status": 3}
+
+# systemctl show property lines and list-unit-files rows, matched in C
+_SHOW_PROPERTY_RE = re.compile(r"^(\w+)=(.*)$", re.M)
+_UNIT_FILE_RE = re.compile(r"^(\S+)(?:[ \t]+(\S+))?", re.M)
+
+# Single lookup for the named services; CORE wins over SYSTEM. One hash probe
+# already rejects unlisted names, so no prefix pre-filter is layered on top.
+_SERVICE_CLASSES = {
+    **{name: "SYSTEM" for name in SYSTEM_SERVICES},
+    **{name: "CORE" for name in CORE_SERVICES},
 }
 
 
@@ -52,6 +84,49 @@ class ResourceResponse(BaseModel):
     allowed_actions: List[str] = Field(default_factory=list)
 
 
+_RESOURCE_COLUMNS = "id, name, type, class, provider, state, health_score, managed, updated_at"
+
+
+# One fixed statement for every filter combination so SQLite prepares it once
+_LIST_RESOURCES_QUERY = f"""
+    SELECT {_RESOURCE_COLUMNS} FROM resources
+    WHERE (:provider IS NULL OR provider = :provider)
+      AND (:class IS NULL OR class = :class)
+      AND (:managed IS NULL OR managed = :managed)
+    ORDER BY name
+"""
+
+
+# ResourceResponse field for each _RESOURCE_COLUMNS position
+_RESOURCE_FIELDS = (
+    "id", "name", "type", "resource_class", "provider", "state", "health_score",
+    "managed", "updated_at",
+)
+
+
+def _row_to_dict(row) -> dict:
+    """Project a _RESOURCE_COLUMNS row onto the ResourceResponse fields."""
+    resource = dict(zip(_RESOURCE_FIELDS, row))
+    resource.update(
+        managed=bool(resource["managed"]),
+        cpu_usage=0.0,
+        memory_usage=0.0,
+        active_state=None,
+        sub_state=None,
+        unit_file_state=None,
+        allowed_actions=[],
+    )
+    return resource
+
+
+def _row_to_resource(row) -> ResourceResponse:
+    """Build a ResourceResponse from a _RESOURCE_COLUMNS row.
+
+    Rows come from our own schema, so model_construct skips re-validation.
+    """
+    return ResourceResponse.model_construct(**_row_to_dict(row))
+
+
 class ActionRequest(BaseModel):
     action: str
     params: Optional[dict] = None
@@ -64,7 +139,11 @@ class ActionResponse(BaseModel):
 
 
 # Routes
-@router.get("", response_model=List[ResourceResponse])
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": List[ResourceResponse]}},
+)
 async def list_resources(
     provider: Optional[str] = Query(None, description="Filter by provider"),
     resource_class: Optional[str] = Query(None, description="Filter by class"),
@@ -72,63 +151,53 @@ async def list_resources(
     refresh: bool = Query(False, description="Bypass the short-lived service cache"),
     user: dict = Depends(get_current_user)
 ):
-    """List resources with systemd state sourced from the live host."""
-    live_services = await _get_live_systemd_services(force_refresh=refresh)
+    """List resources with systemd state sourced from the live host.
+
+    Rows are trusted projections of our own data, so the response is built
+    as plain dicts and serialized by orjson without a validation pass.
+    """
+    unfiltered = not resource_class and managed is None
+    # Other providers live only in the database; skip the host round-trip
+    live_payload: List[dict] = []
+    live_bytes = b"[]"
     if provider in (None, "systemd"):
-        filtered = live_services
-        if resource_class:
-            filtered = [item for item in filtered if item.resource_class == resource_class]
-        if managed is not None:
-            filtered = [item for item in filtered if item.managed is managed]
+        live_services = await _get_live_systemd_services(force_refresh=refresh)
+        if unfiltered:
+            live_payload, live_bytes = _serialized_services(live_services)
+        else:
+            if resource_class:
+                live_services = [item for item in live_services if item.resource_class == resource_class]
+            if managed is not None:
+                live_services = [item for item in live_services if item.managed is managed]
+            live_payload = [item.model_dump() for item in live_services]
         if provider == "systemd":
-            return filtered
+            # Systemd rows are never read from the database
+            if unfiltered:
+                return Response(content=live_bytes, media_type="application/json")
+            return ORJSONResponse(live_payload)
 
     db = await get_control_db()
-    
-    query = "SELECT id, name, type, class, provider, state, health_score, managed, updated_at FROM resources WHERE 1=1"
-    params = []
-    
-    if provider:
-        query += " AND provider = ?"
-        params.append(provider)
-    
-    if resource_class:
-        query += " AND class = ?"
-        params.append(resource_class)
-    
-    if managed is not None:
-        query += " AND managed = ?"
-        params.append(1 if managed else 0)
-    
-    query += " ORDER BY name"
-    
-    cursor = await db.execute(query, params)
+    cursor = await db.execute(
+        _LIST_RESOURCES_QUERY,
+        {
+            "provider": provider or None,
+            "class": resource_class or None,
+            "managed": None if managed is None else int(managed),
+        },
+    )
     rows = await cursor.fetchall()
     
-    stored_resources = [
-        ResourceResponse(
-            id=row[0],
-            name=row[1],
-            type=row[2],
-            resource_class=row[3],
-            provider=row[4],
-            state=row[5],
-            health_score=row[6],
-            managed=bool(row[7]),
-            updated_at=row[8]
-        )
-        for row in rows
-        if row[4] != "systemd"
+    stored = [
+        resource for resource in map(_row_to_dict, rows)
+        if resource["provider"] != "systemd"
     ]
-    return live_services + stored_resources if provider is None else stored_resources
+    if not stored and provider is None and unfiltered:
+        return Response(content=live_bytes, media_type="application/json")
+    return ORJSONResponse(live_payload + stored)
 
 
 def _classify_service(name: str) -> str:
-    if name in CORE_SERVICES or name.startswith("systemd-"):
-        return "CORE" if name in CORE_SERVICES else "SYSTEM"
-    if name in SYSTEM_SERVICES:
-        return "SYSTEM"
-    return "APP"
+    return _SERVICE_CLASSES.get(name) or ("SYSTEM" if name.startswith("systemd-") else "APP")
 
 
 def _state_from_systemd(active_state: str, sub_state: str = "") -> str:
@@ -151,97 +220,167 @@ def _allowed_service_actions(resource_class: str) -> List[str]:
     return ["start", "stop", "restart"]
 
 
-async def _get_live_systemd_services(force_refresh: bool = False) -> List[ResourceResponse]:
-    """Get real systemd services from the HOST system via SSH."""
-    global _services_cache
-    
-    # Check cache first (OPT-004: avoid repeated systemctl calls)
+def _merge_units(
+    loaded: Iterable[Tuple[str, str, str]],
+    installed: Iterable[Tuple[str, str]],
+) -> Dict[str, Tuple[str, str, str]]:
+    """Map service name to (active_state, sub_state, unit_file_state).
+
+    `loaded` holds (unit, active_state, sub_state) for loaded units and
+    `installed` holds (unit, unit_file_state) for unit files; installed units
+    that are not loaded are reported as inactive/dead. Kept free of model
+    objects and fully typed so the hot loop stays cheap.
+    """
+    units: Dict[str, Tuple[str, str, str]] = {}
+    for unit_name, active_state, sub_state in loaded:
+        if unit_name.endswith(".service"):
+            units[unit_name.removesuffix(".service")] = (active_state, sub_state, "unknown")
+
+    for unit_name, unit_file_state in installed:
+        if not unit_name.endswith(".service") or "@." in unit_name:
+            continue
+        name = unit_name.removesuffix(".service")
+        active_state, sub_state, _ = units.get(name, ("inactive", "dead", ""))
+        units[name] = (active_state, sub_state, unit_file_state)
+    return units
+
+
+def _parse_units(output: str, unit_files: str) -> Dict[str, Tuple[str, str, str]]:
+    """Merge `systemctl show` key=value blocks and `systemctl list-unit-files` output."""
+    loaded = []
+    for block in output.split("\n\n"):
+        properties = dict(_SHOW_PROPERTY_RE.findall(block))
+        if "Id" in properties:
+            loaded.append((
+                properties["Id"],
+                properties.get("ActiveState") or "unknown",
+                properties.get("SubState", ""),
+            ))
+
+    installed = [
+        (unit_name, unit_file_state or "unknown")
+        for unit_name, unit_file_state in _UNIT_FILE_RE.findall(unit_files)
+    ]
+    return _merge_units(loaded, installed)
+
+
+async def _list_unit_states() -> Dict[str, Tuple[str, str, str]]:
+    """Read service unit states, over D-Bus when possible, else via systemctl."""
+    bus_units = await systemd_bus.list_units(timeout=LIST_TIMEOUT_S)
+    if bus_units is not None:
+        return _merge_units(*bus_units)
+
+    # Loaded units (running, failed, exited, loaded) and installed unit
+    # files are independent queries; run them concurrently.
+    output, unit_files = await asyncio.gather(
+        run_host_command_async(
+            "systemctl show '*.service' --all --no-pager --property=Id,ActiveState,SubState",
+            timeout=LIST_TIMEOUT_S,
+        ),
+        run_host_command_async(
+            "systemctl list-unit-files --type=service --no-pager --no-legend",
+            timeout=LIST_TIMEOUT_S,
+        ),
+    )
+    return _parse_units(output or "", unit_files)
+
+
+def _invalidate_services_cache() -> None:
+    global _services_cache, _services_generation
+    _services_cache = ([], 0.0)
+    _services_generation += 1
+
+
+def _cached_services() -> Optional[List[ResourceResponse]]:
     cached_services, cache_time = _services_cache
-    if not force_refresh and cached_services and (time.time() - cache_time) < _CACHE_TTL_SECONDS:
+    if cached_services and (time.monotonic() - cache_time) < settings.resource_cache_ttl_sec:
         return cached_services
-    
-    # Get Usage Data first (single ps command)
+    return None
+
+
+def _serialized_services(services: List[ResourceResponse]) -> Tuple[List[dict], bytes]:
+    """Return the dicts and JSON bytes for a service list, reusing the last encoding.
+
+    The cache hands out the same list object until it expires, so identity is
+    enough to tell whether the stored encoding is still current.
+    """
+    global _services_payload
+    source, payload, encoded = _services_payload
+    if source is not services:
+        payload = [item.model_dump() for item in services]
+        encoded = orjson.dumps(payload)
+        _services_payload = (services, payload, encoded)
+    return payload, encoded
+
+
+async def _get_live_systemd_services(force_refresh: bool = False) -> List[ResourceResponse]:
+    """Get real systemd services from the HOST system via SSH.
+
+    Results are cached for RESOURCE_CACHE_TTL_SEC. Refreshes are single-flight:
+    concurrent callers wait for the in-progress refresh and share its result.
+    """
+    # Check cache first (OPT-004: avoid repeated systemctl calls)
+    if not force_refresh:
+        cached = _cached_services()
+        if cached is not None:
+            return cached
+
+    async with _services_refresh_lock:
+        # Another request may have refreshed the cache while we waited
+        if not force_refresh:
+            cached = _cached_services()
+            if cached is not None:
+                return cached
+        return await _refresh_live_systemd_services()
+
+
+async def _read_usage_map() -> Dict[str, Dict[str, float]]:
+    """Per-unit CPU and memory usage; the process sampler locally, else a single ps call."""
+    if PSUTIL_AVAILABLE and not is_running_in_container():
+        # Read the sampler's last tick: calling cpu_percent here would reset
+        # its per-process baselines. Sample directly only before its first run
+        if process_sampler.usage_by_unit is None:
+            await asyncio.to_thread(process_sampler.sample)
+        return process_sampler.usage_by_unit
+
     usage_map = {}
     try:
-        # ps -axo unit,pcpu,pmem --no-headers
-        ps_out = run_host_command_simple("ps -axo unit,pcpu,pmem --no-headers", timeout=5)
-        if ps_out:
-            for line in ps_out.splitlines():
-                parts = line.strip().split()
-                if len(parts) >= 3:
-                     unit = parts[0]
-                     try:
-                         usage_map[unit] = {
-                             "cpu": float(parts[1]),
-                             "mem": float(parts[2])
-                         }
-                     except ValueError:
-                         pass
+        ps_out = await run_host_command_async(
+            "ps -axo unit,pcpu,pmem --no-headers", timeout=LIST_TIMEOUT_S
+        )
     except (OSError, TimeoutError) as e:
-        print(f"Discovery usage map error: {e}")
-
+        logger.warning("Discovery usage map failed", error=str(e))
+        return usage_map
+    for line in ps_out.splitlines():
+        parts = line.split()
+        if len(parts) >= 3:
+            try:
+                usage_map[parts[0]] = {"cpu": float(parts[1]), "mem": float(parts[2])}
+            except ValueError:
+                pass
+    return usage_map
+
+
+async def _refresh_live_systemd_services() -> List[ResourceResponse]:
+    global _services_cache
+    generation = _services_generation
 
     services = []
     
     try:
-        # Get list of ALL loaded services (running, failed, exited, loaded)
-        output = run_host_command_simple(
-            "systemctl list-units --type=service --all --no-pager --plain --no-legend",
-            timeout=15
-        )
-        
-        if not output:
-             output = ""
-
+        # Usage and unit states are independent host queries; overlap them
         now = utc_now().isoformat()
-        unit_states = {}
+        usage_map, unit_states = await asyncio.gather(_read_usage_map(), _list_unit_states())
 
-        # Parse loaded services (active or inactive but loaded)
-        for line in output.splitlines():
-             parts = line.split()
-             if len(parts) < 1: continue
-             
-             unit_name = parts[0]
-             if not unit_name.endswith(".service"): continue
-             
-             name = unit_name.replace(".service", "")
-             active_state = parts[2] if len(parts) > 2 else "unknown"
-             sub_state = parts[3] if len(parts) > 3 else ""
-             unit_states[name] = {
-                 "state": _state_from_systemd(active_state, sub_state),
-                 "active_state": active_state,
-                 "sub_state": sub_state,
-                 "unit_file_state": "unknown",
-             }
-
-        unit_files = run_host_command_simple(
-            "systemctl list-unit-files --type=service --no-pager --no-legend",
-            timeout=15,
-        )
-        for line in unit_files.splitlines():
-            parts = line.split()
-            if parts and parts[0].endswith(".service") and "@." not in parts[0]:
-                name = parts[0].removesuffix(".service")
-                unit_file_state = parts[1] if len(parts) > 1 else "unknown"
-                details = unit_states.setdefault(
-                    name,
-                    {
-                        "state": "stopped",
-                        "active_state": "inactive",
-                        "sub_state": "dead",
-                        "unit_file_state": unit_file_state,
-                    },
-                )
-                details["unit_file_state"] = unit_file_state
-
-        for name, details in unit_states.items():
+        for name, (active_state, sub_state, unit_file_state) in unit_states.items():
              unit_name = f"{name}.service"
              r_class = _classify_service(name)
-             state = details["state"]
+             state = _state_from_systemd(active_state, sub_state)
 
              use_data = usage_map.get(unit_name, {"cpu": 0.0, "mem": 0.0})
              
-             services.append(ResourceResponse(
+             # Every field is built here from parsed host output; skip re-validation
+             services.append(ResourceResponse.model_construct(
                  id=f"systemd-{name}",
                  name=name,
                  type="service",
@@ -258,19 +397,20 @@ async def _get_live_systemd_services(force_refresh: bool = False) -> List[Resour
                  updated_at=now,
                  cpu_usage=use_data["cpu"],
                  memory_usage=use_data["mem"],
-                 active_state=details["active_state"],
-                 sub_state=details["sub_state"],
-                 unit_file_state=details["unit_file_state"],
+                 active_state=active_state,
+                 sub_state=sub_state,
+                 unit_file_state=unit_file_state,
                  allowed_actions=_allowed_service_actions(r_class),
              ))
              
         # Update cache before returning (OPT-004)
         result = sorted(services, key=lambda s: (s.resource_class != "APP", s.name))
-        _services_cache = (result, time.time())
+        if generation == _services_generation:
+            _services_cache = (result, time.monotonic())
         return result
 
-    except (OSError, TimeoutError, ValueError) as e:
-        print(f"Error fetching services: {e}")
+    except (OSError, TimeoutError, ValueError):
+        logger.exception("Failed to get systemd services")
         return []
 
 
@@ -280,25 +420,11 @@ async def list_unmanaged_resources(user: dict = Depends(get_current_user)):
     db = await get_control_db()
     
     cursor = await db.execute(
-        """SELECT id, name, type, class, provider, state, health_score, managed, updated_at
-           FROM resources WHERE managed = 0 ORDER BY discovered_at DESC"""
+        f"SELECT {_RESOURCE_COLUMNS} FROM resources WHERE managed = 0 ORDER BY discovered_at DESC"
     )
     rows = await cursor.fetchall()
     
-    return [
-        ResourceResponse(
-            id=row[0],
-            name=row[1],
-            type=row[2],
-            resource_class=row[3],
-            provider=row[4],
-            state=row[5],
-            health_score=row[6],
-            managed=bool(row[7]),
-            updated_at=row[8]
-        )
-        for row in rows
-    ]
+    return [_row_to_resource(row) for row in rows]
 
 
 @router.get("/{resource_id}/dependencies")
@@ -323,8 +449,7 @@ async def get_resource(resource_id: str, user: dict = Depends(get_current_user))
     db = await get_control_db()
     
     cursor = await db.execute(
-        """SELECT id, name, type, class, provider, state, health_score, managed, updated_at
-           FROM resources WHERE id = ?""",
+        f"SELECT {_RESOURCE_COLUMNS} FROM resources WHERE id = ?",
         (resource_id,)
     )
     row = await cursor.fetchone()
@@ -332,17 +457,7 @@ async def get_resource(resource_id: str, user: dict = Depends(get_current_user))
     if not row:
         raise HTTPException(status_code=404, detail="Resource not found")
     
-    return ResourceResponse(
-        id=row[0],
-        name=row[1],
-        type=row[2],
-        resource_class=row[3],
-        provider=row[4],
-        state=row[5],
-        health_score=row[6],
-        managed=bool(row[7]),
-        updated_at=row[8]
-    )
+    return _row_to_resource(row)
 
 
 @router.post("/{resource_id}/action", response_model=ActionResponse)
@@ -352,8 +467,6 @@ async def execute_action(
     user: dict = Depends(require_role("admin", "operator"))
 ):
     """Execute an action on a resource."""
-    global _services_cache
-
     db = await get_control_db()
     
     # Get resource from DB
@@ -372,7 +485,7 @@ async def execute_action(
     elif not row:
         raise HTTPException(status_code=404, detail="Resource not found")
     else:
-        resource_name, resource_class, provider = row[1], row[2], row[3]
+        _, resource_name, resource_class, provider = row
     
     # Check CORE protection
     if resource_class == "CORE":
@@ -392,23 +505,30 @@ async def execute_action(
         service_name = resource_id.replace("systemd-", "")
         try:
             agent_resource_id = f"{service_name}.service"
-            action_result = await agent_client.execute_action(agent_resource_id, request.action, request.params)
+            action_result = await agent_client.execute_action(
+                agent_resource_id,
+                request.action,
+                request.params,
+                action_timeout=ACTION_TIMEOUTS.get(request.action, 30),
+            )
         except Exception as exc:
             raise HTTPException(status_code=503, detail=f"Agent unavailable: {exc}") from exc
     else:
         # Try agent RPC for other providers
         try:
-            action_result = await agent_client.execute_action(resource_id, request.action, request.params)
+            action_result = await agent_client.execute_action(
+                resource_id,
+                request.action,
+                request.params,
+                action_timeout=ACTION_TIMEOUTS.get(request.action, 30),
+            )
         except Exception:
             action_result = {"success": False, "message": "Agent unavailable"}
     
-    # Audit log
-    await db.execute(
-        """INSERT INTO audit_log (user_id, action, resource_id, details)
-           VALUES (?, ?, ?, ?)""",
-        (user["id"], f"resource.{request.action}", resource_id, str(request.params))
+    # Audit log (batched off the request path)
+    audit_writer.enqueue(
+        user["id"], f"resource.{request.action}", resource_id, orjson.dumps(request.params or {}).decode()
     )
-    await db.commit()
     
     if not action_result:
         raise HTTPException(status_code=500, detail="Action failed: no result returned")
@@ -420,10 +540,12 @@ async def execute_action(
             status_code = 403
         elif error_code == "NOT_FOUND":
             status_code = 404
+        elif error_code == "TIMEOUT":
+            status_code = 504
         raise HTTPException(status_code=status_code, detail=action_result.get("message", "Action failed"))
 
     # Invalidate caches and wait briefly for systemd to settle.
-    _services_cache = ([], 0)
+    _invalidate_services_cache()
     expected_active_state = "inactive" if request.action == "stop" else "active"
     updated_resource = None
     for _ in range(20):
@@ -470,18 +592,20 @@ async def manage_resource(
            WHERE id = ?""",
         (resource_class, resource_id)
     )
-    await db.commit()
     
     if result.rowcount == 0:
+        # Nothing was written; a rollback here would discard other coroutines'
+        # pending work on the shared connection
         raise HTTPException(status_code=404, detail="Resource not found")
     
-    # Audit log
+    # Audit log (same transaction as the update: one commit, one WAL sync)
     await db.execute(
         """INSERT INTO audit_log (user_id, action, resource_id, details)
            VALUES (?, ?, ?, ?)""",
-        (user["id"], "resource.manage", resource_id, f"class: {resource_class}")
+        (user["id"], "resource.manage", resource_id, orjson.dumps({"class": resource_class}).decode())
     )
     await db.commit()
+    dashboard_counts.invalidate()
     
     return {"message": f"Resource {resource_id} is now managed as {resource_class}"}
 
@@ -500,17 +624,19 @@ async def ignore_resource(
         "DELETE FROM resources WHERE id = ? AND managed = 0",
         (resource_id,)
     )
-    await db.commit()
     
     if result.rowcount == 0:
+        # Nothing was written; a rollback here would discard other coroutines'
+        # pending work on the shared connection
         raise HTTPException(status_code=404, detail="Unmanaged resource not found")
     
-    # Audit log
+    # Audit log (same transaction as the delete)
     await db.execute(
         """INSERT INTO audit_log (user_id, action, resource_id)
            VALUES (?, ?, ?)""",
         (user["id"], "resource.ignore", resource_id)
     )
     await db.commit()
+    dashboard_counts.invalidate()
     
     return {"message": f"Resource {resource_id} ignored"}
@@ -4,8 +4,11 @@ Pi Control Panel - SSE Router
 Server-Sent Events endpoints for real-time updates.
 """
 
-import uuid
+import itertools
+import time
+from typing import List, Optional
 
+import orjson
 from fastapi import APIRouter, Depends, Request
 from sse_starlette.sse import EventSourceResponse
 
@@ -14,39 +17,63 @@ from .auth import get_current_user, get_current_user_sse
 
 router = APIRouter()
 
+# Disconnects need no polling here: EventSourceResponse watches for
+# http.disconnect itself and cancels the stream, which runs each generator's
+# finally block.
 
-@router.get("/stream")
-async def stream(request: Request, user: dict = Depends(get_current_user)):
-    """Main SSE stream endpoint. Subscribe to channels via query params."""
-    client_id = str(uuid.uuid4())
-    
-    # Get requested channels from query params
-    channels = request.query_params.get("channels", "").split(",")
-    channels = [c.strip() for c in channels if c.strip()]
-    
-    # Default channels if none specified
-    if not channels:
-        channels = [Channels.TELEMETRY, Channels.RESOURCES, Channels.ALERTS]
-    
+# Client ids only need to be unique within this process
+_client_ids = itertools.count()
+_started = int(time.time())
+
+
+def _connected_frame(payload: dict) -> bytes:
+    """Encode the initial `connected` event as a complete SSE frame."""
+    return b"event: connected\ndata: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def _run_sse(
+    user: dict,
+    channels: List[str],
+    initial: Optional[dict] = None,
+    announce_client: bool = False,
+) -> EventSourceResponse:
+    """Connect a client, subscribe it to `channels` and stream until it leaves.
+
+    A `connected` event opens the stream when `initial` is given, or with the
+    new client id when `announce_client` is set.
+    """
+    client_id = f"c{_started}-{next(_client_ids)}"
     client = await sse_manager.connect(client_id, user["id"])
-    
-    # Subscribe to channels
     for channel in channels:
         await sse_manager.subscribe(client_id, channel)
-    
+
     async def event_stream():
         try:
+            if initial is not None:
+                yield _connected_frame(initial)
+            elif announce_client:
+                yield _connected_frame({"client_id": client_id})
             async for event in sse_manager.event_generator(client):
-                # Check if client disconnected
-                if await request.is_disconnected():
-                    break
                 yield event
         finally:
             await sse_manager.disconnect(client_id)
-    
+
     return EventSourceResponse(event_stream())
 
 
+@router.get("/stream")
+async def stream(request: Request, user: dict = Depends(get_current_user)):
+    """Main SSE stream endpoint. Subscribe to channels via query params."""
+    channels = request.query_params.get("channels", "").split(",")
+    channels = [c.strip() for c in channels if c.strip()]
+    
+    # Default channels if none specified
+    if not channels:
+        channels = [Channels.TELEMETRY, Channels.RESOURCES, Channels.ALERTS]
+    
+    return await _run_sse(user, channels)
+
+
 @router.get("/telemetry")
 async def telemetry_stream(
     request: Request,
@@ -57,46 +84,13 @@ async def telemetry_stream(
     Accepts token as query param since EventSource doesn't support custom headers.
     Example: /api/sse/telemetry?token=<jwt_token>
     """
-    client_id = str(uuid.uuid4())
-    
-    client = await sse_manager.connect(client_id, user["id"])
-    await sse_manager.subscribe(client_id, Channels.TELEMETRY)
-    
-    async def event_stream():
-        try:
-            # Send initial telemetry
-            yield f"event: connected\ndata: {{\"client_id\": \"{client_id}\"}}\n\n"
-            
-            async for event in sse_manager.event_generator(client):
-                if await request.is_disconnected():
-                    break
-                yield event
-        finally:
-            await sse_manager.disconnect(client_id)
-    
-    return EventSourceResponse(event_stream())
+    return await _run_sse(user, [Channels.TELEMETRY], announce_client=True)
 
 
 @router.get("/resources")
 async def resources_stream(request: Request, user: dict = Depends(get_current_user)):
     """Stream resource updates."""
-    client_id = str(uuid.uuid4())
-    
-    client = await sse_manager.connect(client_id, user["id"])
-    await sse_manager.subscribe(client_id, Channels.RESOURCES)
-    
-    async def event_stream():
-        try:
-            yield f"event: connected\ndata: {{\"client_id\": \"{client_id}\"}}\n\n"
-            
-            async for event in sse_manager.event_generator(client):
-                if await request.is_disconnected():
-                    break
-                yield event
-        finally:
-            await sse_manager.disconnect(client_id)
-    
-    return EventSourceResponse(event_stream())
+    return await _run_sse(user, [Channels.RESOURCES], announce_client=True)
 
 
 @router.get("/logs/{resource_id}")
@@ -106,23 +100,7 @@ async def logs_stream(
     user: dict = Depends(get_current_user)
 ):
     """Stream logs for a specific resource."""
-    client_id = str(uuid.uuid4())
-    
-    client = await sse_manager.connect(client_id, user["id"])
-    await sse_manager.subscribe(client_id, Channels.logs(resource_id))
-    
-    async def event_stream():
-        try:
-            yield f"event: connected\ndata: {{\"resource_id\": \"{resource_id}\"}}\n\n"
-            
-            async for event in sse_manager.event_generator(client):
-                if await request.is_disconnected():
-                    break
-                yield event
-        finally:
-            await sse_manager.disconnect(client_id)
-    
-    return EventSourceResponse(event_stream())
+    return await _run_sse(user, [Channels.logs(resource_id)], {"resource_id": resource_id})
 
 
 @router.get("/jobs/{job_id}")
@@ -132,45 +110,13 @@ async def job_stream(
     user: dict = Depends(get_current_user)
 ):
     """Stream updates for a specific job."""
-    client_id = str(uuid.uuid4())
-    
-    client = await sse_manager.connect(client_id, user["id"])
-    await sse_manager.subscribe(client_id, Channels.job(job_id))
-    
-    async def event_stream():
-        try:
-            yield f"event: connected\ndata: {{\"job_id\": \"{job_id}\"}}\n\n"
-            
-            async for event in sse_manager.event_generator(client):
-                if await request.is_disconnected():
-                    break
-                yield event
-        finally:
-            await sse_manager.disconnect(client_id)
-    
-    return EventSourceResponse(event_stream())
+    return await _run_sse(user, [Channels.job(job_id)], {"job_id": job_id})
 
 
 @router.get("/alerts")
 async def alerts_stream(request: Request, user: dict = Depends(get_current_user)):
     """Stream alert updates."""
-    client_id = str(uuid.uuid4())
-    
-    client = await sse_manager.connect(client_id, user["id"])
-    await sse_manager.subscribe(client_id, Channels.ALERTS)
-    
-    async def event_stream():
-        try:
-            yield f"event: connected\ndata: {{\"client_id\": \"{client_id}\"}}\n\n"
-            
-            async for event in sse_manager.event_generator(client):
-                if await request.is_disconnected():
-                    break
-                yield event
-        finally:
-            await sse_manager.disconnect(client_id)
-    
-    return EventSourceResponse(event_stream())
+    return await _run_sse(user, [Channels.ALERTS], announce_client=True)
 
 
 @router.get("/stats")
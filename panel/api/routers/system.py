@@ -5,18 +5,22 @@ Handles system-level operations like reboot, shutdown, and updates.
 """
 
 import asyncio
-import time
+import platform
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from db import get_control_db
+from services.host_files import read_small, read_static
+from services.process_sampler import PSUTIL_AVAILABLE, process_sampler
 from .auth import require_role, get_current_user
 
-router = APIRouter()
-_system_info_cache = {"data": None, "expires_at": 0.0}
-_processes_cache = {"data": None, "expires_at": 0.0}
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Longest a reboot/poweroff command may run before it is killed
+POWER_COMMAND_TIMEOUT_S = 30
 
 class SystemInfo(BaseModel):
     hostname: str
@@ -33,6 +37,28 @@ class UpdateStatus(BaseModel):
     latest_version: str
     last_check: str
 
+
+def _read_os_info() -> str:
+    os_release = read_static("/etc/os-release")
+    if not os_release:
+        return f"{platform.system()} {platform.release()}"
+    start = os_release.find(b"PRETTY_NAME=")
+    if start == -1:
+        return "Linux"
+    value = os_release[start + len(b"PRETTY_NAME="):].split(b"\n", 1)[0]
+    return value.strip().strip(b'"').decode(errors="replace")
+
+
+def _read_model() -> str:
+    """Board model from /proc/cpuinfo (Pi specific)."""
+    cpuinfo = b"\n" + read_static("/proc/cpuinfo")
+    start = cpuinfo.find(b"\nModel")
+    if start == -1:
+        return "Generic Linux System"
+    line = cpuinfo[start + 1:].split(b"\n", 1)[0]
+    return line.partition(b":")[2].strip().decode(errors="replace")
+
+
 async def execute_power_command(command_args: list):
     """Execute power command with a small delay to allow response to return."""
     await asyncio.sleep(2)
@@ -42,64 +68,42 @@ async def execute_power_command(command_args: list):
         stdout=asyncio.subprocess.DEVNULL,
         stderr=asyncio.subprocess.DEVNULL
     )
-    await proc.wait()
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=POWER_COMMAND_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
+def _read_uptime() -> int:
+    try:
+        return int(float(read_small("/proc/uptime").split(None, 1)[0]))
+    except (IndexError, ValueError):
+        return 0
+
+
+def _compute_static_info() -> dict:
+    """SystemInfo fields that cannot change while the process runs."""
+    return {
+        "hostname": read_static("/etc/hostname").strip().decode(errors="replace") or platform.node(),
+        "os_info": _read_os_info(),
+        "kernel": platform.release(),
+        "architecture": platform.machine(),
+        "model": _read_model(),
+    }
+
+
+_STATIC_INFO = _compute_static_info()
+
 
 @router.get("/info", response_model=SystemInfo)
 async def get_system_info(user: dict = Depends(get_current_user)):
     """Get detailed system information."""
-    import platform
-    now = time.monotonic()
-    if _system_info_cache["data"] and now < _system_info_cache["expires_at"]:
-        return _system_info_cache["data"]
-    
-    # Get hostname
-    try:
-        with open("/etc/hostname", "r") as f:
-            hostname = f.read().strip()
-    except:
-        hostname = platform.node()
-        
-    # Get OS info
-    try:
-        with open("/etc/os-release", "r") as f:
-            os_info = "Linux"
-            for line in f:
-                if line.startswith("PRETTY_NAME="):
-                    os_info = line.split("=")[1].strip().strip('"')
-                    break
-    except:
-        os_info = f"{platform.system()} {platform.release()}"
-        
-    # Get uptime
-    try:
-        with open("/proc/uptime", "r") as f:
-            uptime = int(float(f.read().split()[0]))
-    except:
-        uptime = 0
-        
-    # Get model (Pi specific)
-    model = "Generic Linux System"
-    try:
-        with open("/proc/cpuinfo", "r") as f:
-            for line in f:
-                if line.startswith("Model"):
-                    model = line.split(":")[1].strip()
-                    break
-    except:
-        pass
-
-    info = SystemInfo(
-        hostname=hostname,
-        os_info=os_info,
-        kernel=platform.release(),
-        architecture=platform.machine(),
-        model=model,
+    return SystemInfo(
+        **_STATIC_INFO,
         time=datetime.now().isoformat(),
-        uptime_seconds=uptime
+        uptime_seconds=_read_uptime(),
     )
-    _system_info_cache["data"] = info
-    _system_info_cache["expires_at"] = time.monotonic() + 10
-    return info
 
 @router.post("/reboot")
 async def reboot_system(
@@ -141,40 +145,14 @@ async def shutdown_system(
 
 @router.get("/processes")
 async def get_processes(user: dict = Depends(get_current_user)):
-    """Get top running processes."""
-    import psutil
-    now = time.monotonic()
-    if _processes_cache["data"] and now < _processes_cache["expires_at"]:
-        return _processes_cache["data"]
-    
-    procs = []
-    for p in psutil.process_iter(['pid', 'name', 'username']):
-        try:
-            # Use onshot to get info efficiently
-            with p.oneshot():
-                # cpu_percent(interval=None) returns 0.0 on first call, but subsequent calls work.
-                # Since we can't persist process objects easily across requests in stateless HTTP, 
-                # we might accept that CPU is 0 or try a small trick.
-                # However, memory is accurate.
-                cpu = p.cpu_percent(interval=None)
-                mem = p.memory_info().rss / (1024 * 1024) # MB
-                
-                procs.append({
-                    "pid": p.pid,
-                    "name": p.name(),
-                    "cpu": round(cpu, 1),
-                    "memory": round(mem, 1)
-                })
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-            
-    # Sort by memory usage descending (since CPU might be 0 often without persistent tracking)
-    # Or sort by CPU if non-zero
-    procs.sort(key=lambda x: x['memory'], reverse=True)
-    
-    _processes_cache["data"] = procs[:10]
-    _processes_cache["expires_at"] = time.monotonic() + 10
-    return _processes_cache["data"] # Return top 10
+    """Get top running processes from the background sampler."""
+    if not PSUTIL_AVAILABLE:
+        return []
+    snapshot = process_sampler.snapshot
+    if not snapshot:
+        # Sampler not running yet; one sample gives memory, CPU reads 0.0
+        snapshot = await asyncio.to_thread(process_sampler.sample)
+    return snapshot[:10]
 
 @router.post("/update")
 async def update_system(
@@ -4,20 +4,55 @@ Pi Control Panel - Telemetry Router
 Handles metrics queries, live telemetry streaming, and dashboard data.
 """
 
+import asyncio
+import atexit
+import hashlib
+import math
+import os
+import re
+import threading
 import time
+from contextlib import suppress
 from datetime import datetime, timezone
-from typing import List, Optional, Dict
-
-from fastapi import APIRouter, Depends, Query, HTTPException
+from itertools import groupby
+from operator import itemgetter
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import orjson
+import structlog
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
-from db import get_telemetry_db
+from config import settings
+from db import delete_in_batches, get_telemetry_db
 from services.agent_client import agent_client
+from services.dashboard_counts import dashboard_counts
+from services.host_files import read_static
+from services.process_sampler import process_sampler
+from services.telemetry_collector import telemetry_collector
 from .auth import get_current_user
 
-router = APIRouter()
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
 _current_metrics_cache: Dict[str, object] = {"data": None, "expires_at": 0.0}
 _CURRENT_METRICS_TTL_SECONDS = 1.0
+_current_metrics_task: Optional[asyncio.Task] = None
+# Previous /proc/stat CPU reading and when it was taken; later samples are
+# deltas against it instead of a blocking 0.5s measurement window
+_cpu_baseline: Dict[str, object] = {"stat": None, "at": 0.0}
+# Older baselines would average over an idle gap between requests
+_CPU_BASELINE_MAX_AGE_SECONDS = 10.0
+# Disk totals move slowly; one statvfs per TTL instead of per sample
+_DISK_TTL_SECONDS = 30.0
+_disk_cache: Dict[str, object] = {"metrics": None, "expires_at": 0.0}
 
 
 class MetricPoint(BaseModel):
@@ -62,38 +97,48 @@ class DashboardData(BaseModel):
     timestamp: str
 
 
-@router.get("/current", response_model=Dict)
-async def get_current_metrics(user: dict = Depends(get_current_user)):
-    """Get current metrics snapshot from agent or local system."""
-    now = time.monotonic()
-    if _current_metrics_cache["data"] and now < _current_metrics_cache["expires_at"]:
-        return _current_metrics_cache["data"]
-
+async def _fetch_current_metrics() -> Dict:
     try:
         telemetry = await agent_client.get_current_telemetry()
-        telemetry = _with_metric_aliases(telemetry)
-        _current_metrics_cache["data"] = telemetry
-        _current_metrics_cache["expires_at"] = time.monotonic() + _CURRENT_METRICS_TTL_SECONDS
-        return telemetry
     except Exception:
         # Fallback: Get real metrics from local system
         telemetry = await _get_local_system_metrics()
-        telemetry = _with_metric_aliases(telemetry)
-        _current_metrics_cache["data"] = telemetry
-        _current_metrics_cache["expires_at"] = time.monotonic() + _CURRENT_METRICS_TTL_SECONDS
-        return telemetry
+    telemetry = _with_metric_aliases(telemetry)
+    _current_metrics_cache["data"] = telemetry
+    _current_metrics_cache["expires_at"] = time.monotonic() + _CURRENT_METRICS_TTL_SECONDS
+    return telemetry
+
+
+async def _current_snapshot() -> Dict:
+    """Return the cached snapshot, sharing one in-flight fetch between callers."""
+    global _current_metrics_task
+    if _current_metrics_cache["data"] and time.monotonic() < _current_metrics_cache["expires_at"]:
+        return _current_metrics_cache["data"]
+    if _current_metrics_task is None or _current_metrics_task.done():
+        _current_metrics_task = asyncio.create_task(_fetch_current_metrics())
+    # Shielded so one client disconnecting does not cancel the shared fetch
+    return await asyncio.shield(_current_metrics_task)
+
+
+@router.get("/current", response_model=Dict)
+async def get_current_metrics(user: dict = Depends(get_current_user)):
+    """Get current metrics snapshot from agent or local system."""
+    return await _current_snapshot()
+
+
+# Canonical disk metric keys and the legacy keys kept in sync with them
+_METRIC_ALIASES = (
+    ("disk.root.used_pct", ("disk._root.used_pct", "disk._root.pct")),
+    ("disk.root.used_gb", ("disk._root.used_gb",)),
+    ("disk.root.total_gb", ("disk._root.total_gb",)),
+)
 
 
 def _with_metric_aliases(telemetry: Dict) -> Dict:
     """Expose canonical disk keys and legacy aliases during schema migration."""
     result = dict(telemetry)
     metrics = dict(result.get("metrics") or {})
-    aliases = {
-        "disk.root.used_pct": ("disk._root.used_pct", "disk._root.pct"),
-        "disk.root.used_gb": ("disk._root.used_gb",),
-        "disk.root.total_gb": ("disk._root.total_gb",),
-    }
-    for canonical, legacy_keys in aliases.items():
+    for canonical, legacy_keys in _METRIC_ALIASES:
         value = metrics.get(canonical)
         if value is None:
             value = next((metrics[key] for key in legacy_keys if key in metrics), None)
@@ -106,264 +151,317 @@ def _with_metric_aliases(telemetry: Dict) -> Dict:
     return result
 
 
-async def _get_local_system_metrics() -> Dict:
-    """Get real HOST system metrics by reading from mounted /host filesystem."""
-    import asyncio
-    import subprocess
-    import os
-    
-    metrics = {}
-    
-    # Check if we have host access via /host mount
-    host_root = "/host" if os.path.exists("/host/proc") else ""
-    
-    # ============ CPU Usage ============
-    # ============ CPU Usage ============
+# Host files read by the local sampler, relative to the host root
+_HOST_FILES = (
+    "/proc/meminfo",
+    "/proc/loadavg",
+    "/sys/class/thermal/thermal_zone0/temp",
+    "/proc/net/dev",
+    "/proc/uptime",
+)
+
+# Decode common ARM CPU parts
+_ARM_CPU_PARTS = {
+    "0xd0b": "ARM Cortex-A76",
+    "0xd07": "ARM Cortex-A57",
+    "0xd08": "ARM Cortex-A72",
+    "0xd03": "ARM Cortex-A53",
+    "0xd04": "ARM Cortex-A35",
+}
+
+
+# Only the fields the sampler reports are pulled out of the raw bytes
+_MEMINFO_RE = re.compile(rb"^(MemTotal|MemAvailable|MemFree):\s+(\d+)", re.M)
+_CPU_MODEL_RE = re.compile(rb"^(CPU part|model name)\s*:\s*(.*)$", re.M)
+
+
+# Files re-read on every sample keep an open descriptor; pread at offset 0
+# makes the kernel regenerate them without another open/close pair
+_PERSISTENT_FILES = frozenset({
+    "/proc/stat", "/proc/meminfo", "/proc/loadavg", "/proc/net/dev", "/proc/uptime",
+})
+_proc_fds: Dict[str, int] = {}
+_proc_fds_lock = threading.Lock()
+
+
+def _read_persistent(full_path: str) -> bytes:
+    with _proc_fds_lock:
+        fd = _proc_fds.get(full_path)
+        if fd is None:
+            fd = _proc_fds[full_path] = os.open(full_path, os.O_RDONLY)
+    chunks = []
+    offset = 0
     try:
-        import psutil
-        # Use asyncio.to_thread to avoid blocking the event loop
-        metrics["host.cpu.pct_total"] = await asyncio.to_thread(psutil.cpu_percent, 0.5)
-    except (OSError, ImportError, ValueError):
+        while True:
+            chunk = os.pread(fd, 65536, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+    except OSError:
+        with _proc_fds_lock:
+            if _proc_fds.get(full_path) == fd:
+                del _proc_fds[full_path]
+                os.close(fd)
+        raise
+    return b"".join(chunks)
+
+
+@atexit.register
+def _close_proc_fds() -> None:
+    with _proc_fds_lock:
+        for fd in _proc_fds.values():
+            os.close(fd)
+        _proc_fds.clear()
+
+
+def _read_host_file(host_root: str, path: str) -> bytes:
+    full_path = f"{host_root}{path}"
+    if path in _PERSISTENT_FILES:
+        return _read_persistent(full_path)
+    with open(full_path, "rb") as f:
+        return f.read()
+
+
+def _read_host_files(host_root: str) -> Dict[str, Optional[bytes]]:
+    """Read every sampled host file; missing ones map to None."""
+    contents: Dict[str, Optional[bytes]] = {}
+    for path in _HOST_FILES:
         try:
-            # Manual fallback: Read /proc/stat twice
-            def read_stat():
-                with open(f"{host_root}/proc/stat", "r") as f:
-                    line = f.readline()
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        idle = int(parts[4])
-                        total = sum(int(p) for p in parts[1:])
-                        return total, idle
-                return 0, 0
-
-            t1, i1 = read_stat()
-            if t1 > 0:
+            contents[path] = _read_host_file(host_root, path)
+        except OSError:
+            contents[path] = None
+    return contents
+
+
+def _load_static_sysinfo(host_root: str) -> Dict[str, str]:
+    """Hostname, kernel and CPU description; none of them change while the host is up."""
+    def read(path: str) -> bytes:
+        return read_static(f"{host_root}{path}")
+
+    hostname = read("/etc/hostname").strip().decode(errors="replace") or "raspberrypi"
+
+    # Extract kernel version
+    os_info = "Linux"
+    parts = read("/proc/version").split()
+    if len(parts) >= 3:
+        os_info = f"Linux {parts[2].decode(errors='replace')}"
+
+    # Get CPU model and architecture (not Pi model name); the first of
+    # "CPU part" (ARM) or "model name" wins
+    cpu_model = "Unknown"
+    match = _CPU_MODEL_RE.search(read("/proc/cpuinfo"))
+    if match:
+        value = match.group(2).strip().decode(errors="replace")
+        if match.group(1) == b"CPU part":
+            cpu_model = _ARM_CPU_PARTS.get(value, f"ARM ({value})")
+        else:
+            cpu_model = value
+
+    # Architecture, e.g. aarch64, x86_64; the kernel is shared with the host
+    arch = os.uname().machine or "unknown"
+    return {"hostname": hostname, "os": os_info, "machine": f"{cpu_model} ({arch})"}
+
+
+# Host access comes from the /host mount, fixed for the life of the container
+_HOST_ROOT = "/host" if os.path.exists("/host/proc") else ""
+_STATIC_SYSINFO = _load_static_sysinfo(_HOST_ROOT)
+
+
+async def _sample_cpu(host_root: str) -> float:
+    if PSUTIL_AVAILABLE:
+        # The process sampler's tick owns psutil's CPU baseline, so its last
+        # reading always covers the most recent interval
+        if process_sampler.cpu_pct is not None:
+            return process_sampler.cpu_pct
+        try:
+            # No tick yet; measure once off the event loop
+            return await asyncio.to_thread(psutil.cpu_percent, 0.5)
+        except (OSError, ValueError):
+            pass
+    try:
+        # Manual fallback: diff /proc/stat against the previous reading
+        def read_stat():
+            parts = _read_host_file(host_root, "/proc/stat").split(b"\n", 1)[0].split()
+            if len(parts) >= 5:
+                idle = int(parts[4])
+                total = sum(map(int, parts[1:]))
+                return total, idle
+            return 0, 0
+
+        previous = _cpu_baseline["stat"]
+        if previous is None or time.monotonic() - _cpu_baseline["at"] > _CPU_BASELINE_MAX_AGE_SECONDS:
+            previous = read_stat()
+            if previous[0] > 0:
                 await asyncio.sleep(0.5)
-                t2, i2 = read_stat()
-                delta_total = t2 - t1
-                delta_idle = i2 - i1
-                if delta_total > 0:
-                   metrics["host.cpu.pct_total"] = round(100 * (1 - delta_idle / delta_total), 1)
-                else:
-                   metrics["host.cpu.pct_total"] = 0
-            else:
-                metrics["host.cpu.pct_total"] = 0
-        except Exception as e:
-            print(f"CPU calc error: {e}")
-            metrics["host.cpu.pct_total"] = 0
+        t1, i1 = previous
+        t2, i2 = read_stat()
+        _cpu_baseline["stat"] = (t2, i2)
+        _cpu_baseline["at"] = time.monotonic()
+        delta_total = t2 - t1
+        delta_idle = i2 - i1
+        if t1 > 0 and delta_total > 0:
+            return round(100 * (1 - delta_idle / delta_total), 1)
+        return 0
+    except (OSError, ValueError) as e:
+        logger.warning("CPU usage sample failed", error=str(e))
+        return 0
+
+
+def _disk_metrics(host_root: str) -> Dict[str, float]:
+    """Root filesystem usage, re-read at most every _DISK_TTL_SECONDS."""
+    now = time.monotonic()
+    if _disk_cache["metrics"] is not None and now < _disk_cache["expires_at"]:
+        return _disk_cache["metrics"]
+
+    metrics = {}
+    try:
+        # Same figures df reports: used excludes reserved blocks, pct rounds up
+        st = os.statvfs(f"{host_root}/" if host_root else "/")
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        usable = used + st.f_bavail * st.f_frsize
+        pct = math.ceil(100 * used / usable) if usable else 0
+        metrics["disk._root.total_gb"] = round(total / (1024**3), 1)
+        metrics["disk._root.used_gb"] = round(used / (1024**3), 1)
+        metrics["disk._root.pct"] = pct # Legacy key
+        metrics["disk._root.used_pct"] = pct
+    except OSError:
+        if PSUTIL_AVAILABLE:
+            with suppress(OSError, ValueError):
+                disk = psutil.disk_usage("/")
+                metrics["disk._root.pct"] = disk.percent
+                metrics["disk._root.used_pct"] = disk.percent
+                metrics["disk._root.used_gb"] = disk.used / (1024**3)
+                metrics["disk._root.total_gb"] = disk.total / (1024**3)
+
+    _disk_cache["metrics"] = metrics
+    _disk_cache["expires_at"] = now + _DISK_TTL_SECONDS
+    return metrics
+
+
+async def _get_local_system_metrics() -> Dict:
+    """Get real HOST system metrics by reading from mounted /host filesystem.
+
+    Reading and parsing the host files runs in a worker thread, concurrently
+    with the CPU sample, so the event loop never does the sampling work.
+    """
+    cpu_pct, metrics = await asyncio.gather(
+        _sample_cpu(_HOST_ROOT),
+        asyncio.to_thread(_read_local_metrics, _HOST_ROOT),
+    )
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "degrade_mode": False,
+        "source": "host" if _HOST_ROOT else "container",
+        "system": dict(_STATIC_SYSINFO),
+        "metrics": {"host.cpu.pct_total": cpu_pct, **metrics},
+    }
+
+
+def _read_local_metrics(host_root: str) -> Dict:
+    """Every host metric except CPU usage, read and parsed in one blocking pass."""
+    metrics = {}
+    files = _read_host_files(host_root)
     
     # ============ Memory ============
     try:
-        with open(f"{host_root}/proc/meminfo", "r") as f:
-            meminfo = {}
-            for line in f:
-                parts = line.split()
-                if len(parts) >= 2:
-                    key = parts[0].rstrip(":")
-                    meminfo[key] = int(parts[1])  # in kB
-            
-            total = meminfo.get("MemTotal", 0)
-            available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
-            used = total - available
-            
-            metrics["host.mem.total_mb"] = round(total / 1024, 1)
-            metrics["host.mem.used_mb"] = round(used / 1024, 1)
-            metrics["host.mem.available_mb"] = round(available / 1024, 1)
-            metrics["host.mem.pct"] = round(100 * used / total, 1) if total > 0 else 0
-    except (OSError, IOError, ValueError):
-        try:
-            import psutil
-            mem = psutil.virtual_memory()
-            metrics["host.mem.pct"] = mem.percent
-            metrics["host.mem.used_mb"] = mem.used / (1024 * 1024)
-            metrics["host.mem.total_mb"] = mem.total / (1024 * 1024)
-        except (ImportError, ValueError, AttributeError):
-            pass
+        if files["/proc/meminfo"] is None:
+            raise OSError("meminfo unavailable")
+        meminfo = {key: int(value) for key, value in _MEMINFO_RE.findall(files["/proc/meminfo"])}  # in kB
+
+        total = meminfo.get(b"MemTotal", 0)
+        available = meminfo.get(b"MemAvailable", meminfo.get(b"MemFree", 0))
+        used = total - available
+
+        metrics["host.mem.total_mb"] = round(total / 1024, 1)
+        metrics["host.mem.used_mb"] = round(used / 1024, 1)
+        metrics["host.mem.available_mb"] = round(available / 1024, 1)
+        metrics["host.mem.pct"] = round(100 * used / total, 1) if total > 0 else 0
+    except (OSError, ValueError):
+        if PSUTIL_AVAILABLE:
+            with suppress(OSError, ValueError):
+                mem = psutil.virtual_memory()
+                metrics["host.mem.pct"] = mem.percent
+                metrics["host.mem.used_mb"] = mem.used / (1024 * 1024)
+                metrics["host.mem.total_mb"] = mem.total / (1024 * 1024)
     
     # ============ Disk ============
-    try:
-        # Use df command for host disk
-        result = subprocess.run(
-            ["df", "-B1", f"{host_root}/" if host_root else "/"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            lines = result.stdout.strip().split("\n")
-            if len(lines) >= 2:
-                parts = lines[1].split()
-                if len(parts) >= 5:
-                    total = int(parts[1])
-                    used = int(parts[2])
-                    pct = int(parts[4].rstrip("%"))
-                    metrics["disk._root.total_gb"] = round(total / (1024**3), 1)
-                    metrics["disk._root.used_gb"] = round(used / (1024**3), 1)
-                    metrics["disk._root.pct"] = pct # Legacy key
-                    metrics["disk._root.used_pct"] = pct
-    except (OSError, ValueError, subprocess.SubprocessError):
-        try:
-            import psutil
-            disk = psutil.disk_usage("/")
-            metrics["disk._root.pct"] = disk.percent
-            metrics["disk._root.used_pct"] = disk.percent
-            metrics["disk._root.used_gb"] = disk.used / (1024**3)
-            metrics["disk._root.total_gb"] = disk.total / (1024**3)
-        except (ImportError, ValueError, AttributeError):
-            pass
+    metrics.update(_disk_metrics(host_root))
     
+    # Missing files are None and their metrics are left out; malformed
+    # contents are skipped the same way
     # ============ Load Average ============
-    try:
-        with open(f"{host_root}/proc/loadavg", "r") as f:
-            parts = f.read().split()
+    if files["/proc/loadavg"] is not None:
+        with suppress(ValueError, IndexError):
+            parts = files["/proc/loadavg"].split()
             metrics["host.load.1m"] = float(parts[0])
             metrics["host.load.5m"] = float(parts[1])
             metrics["host.load.15m"] = float(parts[2])
-    except (OSError, ValueError, IndexError):
-        pass
     
     # ============ Temperature (Raspberry Pi specific) ============
-    try:
-        # Try Raspberry Pi thermal zone
-        temp_path = f"{host_root}/sys/class/thermal/thermal_zone0/temp"
-        if os.path.exists(temp_path):
-            with open(temp_path, "r") as f:
-                temp_millic = int(f.read().strip())
-                metrics["host.temp.cpu_c"] = round(temp_millic / 1000, 1)
-    except (OSError, ValueError):
-        pass
+    if files["/sys/class/thermal/thermal_zone0/temp"] is not None:
+        with suppress(ValueError):
+            temp_millic = int(files["/sys/class/thermal/thermal_zone0/temp"].strip())
+            metrics["host.temp.cpu_c"] = round(temp_millic / 1000, 1)
     
     # ============ Network ============
-    try:
-        with open(f"{host_root}/proc/net/dev", "r") as f:
+    if files["/proc/net/dev"] is not None:
+        with suppress(ValueError):
             rx_total = tx_total = 0
-            for line in f:
-                if ":" in line and not line.strip().startswith("lo"):
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        values = parts[1].split()
-                        if len(values) >= 9:
-                            rx_total += int(values[0])
-                            tx_total += int(values[8])
+            # Two header lines, then "iface: rx_bytes ... tx_bytes ..."
+            for line in files["/proc/net/dev"].split(b"\n")[2:]:
+                iface, _, rest = line.partition(b":")
+                if iface.strip().startswith(b"lo"):
+                    continue
+                values = rest.split()
+                if len(values) >= 9:
+                    rx_total += int(values[0])
+                    tx_total += int(values[8])
             metrics["host.net.rx_bytes"] = rx_total
             metrics["host.net.tx_bytes"] = tx_total
-    except (OSError, ValueError):
-        pass
     
     # ============ Uptime ============
-    try:
-        with open(f"{host_root}/proc/uptime", "r") as f:
-            uptime_seconds = int(float(f.read().split()[0]))
-            metrics["host.uptime.seconds"] = uptime_seconds
-    except (OSError, ValueError, IndexError):
-        pass
-    
-    # ============ System Info (from HOST) ============
-    hostname = "raspberrypi"
-    os_info = "Linux"
-    machine = "aarch64"
-    
-    try:
-        with open(f"{host_root}/etc/hostname", "r") as f:
-            hostname = f.read().strip()
-    except (OSError, IOError):
-        pass
-    
-    try:
-        with open(f"{host_root}/proc/version", "r") as f:
-            version_line = f.read().strip()
-            # Extract kernel version
-            parts = version_line.split()
-            if len(parts) >= 3:
-                os_info = f"Linux {parts[2]}"
-    except (OSError, ValueError, IndexError):
-        pass
-    
-    # Get CPU model and architecture (not Pi model name)
-    cpu_model = "Unknown"
-    arch = "unknown"
-    
-    try:
-        # Get architecture
-        with open(f"{host_root}/proc/cpuinfo", "r") as f:
-            for line in f:
-                # Look for CPU implementer/part for ARM chips
-                if line.startswith("CPU implementer"):
-                    implementer = line.split(":")[1].strip()
-                elif line.startswith("CPU part"):
-                    part = line.split(":")[1].strip()
-                    # Decode common ARM CPU parts
-                    cpu_parts = {
-                        "0xd0b": "ARM Cortex-A76",
-                        "0xd07": "ARM Cortex-A57", 
-                        "0xd08": "ARM Cortex-A72",
-                        "0xd03": "ARM Cortex-A53",
-                        "0xd04": "ARM Cortex-A35",
-                    }
-                    cpu_model = cpu_parts.get(part, f"ARM ({part})")
-                    break
-                elif line.startswith("model name"):
-                    cpu_model = line.split(":")[1].strip()
-                    break
-    except (OSError, IOError, ValueError):
-        pass
-    
-    try:
-        # Get architecture from uname
-        import subprocess
-        result = subprocess.run(["uname", "-m"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            arch = result.stdout.strip()  # e.g., aarch64, x86_64
-    except (OSError, subprocess.SubprocessError):
-        pass
-    
-    machine = f"{cpu_model} ({arch})"
+    if files["/proc/uptime"] is not None:
+        with suppress(ValueError, IndexError):
+            metrics["host.uptime.seconds"] = int(float(files["/proc/uptime"].split()[0]))
     
-    return {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "degrade_mode": False,
-        "source": "host" if host_root else "container",
-        "system": {
-            "hostname": hostname,
-            "os": os_info,
-            "machine": machine,
-        },
-        "metrics": metrics
-    }
+    return metrics
+
+
+# Polling clients may reuse a dashboard or metric-list body this long
+_POLL_CACHE_CONTROL = "private, max-age=2"
+
+
+def _weak_etag(content) -> str:
+    return 'W/"' + hashlib.blake2b(orjson.dumps(content), digest_size=8).hexdigest() + '"'
+
+
+def _conditional_json(request: Request, content: Dict, etag: str) -> Response:
+    """Answer 304 when the client already holds this ETag, else the JSON body."""
+    headers = {"ETag": etag, "Cache-Control": _POLL_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(content, headers=headers)
 
 
 @router.get("/dashboard", response_model=DashboardData)
-async def get_dashboard_data(user: dict = Depends(get_current_user)):
-    """Get aggregated dashboard data."""
-    from db import get_control_db
-    from services.telemetry_collector import telemetry_collector
-    
-    # Use cached metrics from collector (avoids 0.5s blocking for CPU measurement)
+async def get_dashboard_data(request: Request, user: dict = Depends(get_current_user)):
+    """Get aggregated dashboard data.
+
+    The ETag covers everything but the timestamp, so polls between samples
+    get a 304 with no body.
+    """
+    # Use cached metrics from collector, else the shared /current snapshot
     metrics = telemetry_collector.get_last_metrics()
-    
-    # If no cached metrics, fall back to fresh fetch
     if not metrics:
-        try:
-            telemetry = await agent_client.get_current_telemetry()
-            metrics = telemetry.get("metrics", {})
-        except Exception:
-            local_data = await _get_local_system_metrics()
-            metrics = local_data.get("metrics", {})
-    
-    # Get resource counts from DB
-    db = await get_control_db()
-    cursor = await db.execute(
-        """SELECT class, COUNT(*) FROM resources 
-           WHERE managed = 1 GROUP BY class"""
-    )
-    resource_counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        metrics = (await _current_snapshot()).get("metrics", {})
     
-    # Get alert counts
-    cursor = await db.execute(
-        """SELECT severity, COUNT(*) FROM alerts 
-           WHERE state IN ('pending', 'firing') GROUP BY severity"""
-    )
-    alert_counts = {row[0]: row[1] for row in await cursor.fetchall()}
+    # Resource and alert counts, cached until the next write to either table
+    resource_counts, alert_counts = await dashboard_counts.get()
     
-    return DashboardData(
+    dashboard = DashboardData(
         system=SystemMetrics(
             cpu_pct=metrics.get("host.cpu.pct_total", 0),
             memory_pct=metrics.get("host.mem.pct", 0),
@@ -383,7 +481,9 @@ async def get_dashboard_data(user: dict = Depends(get_current_user)):
         resource_counts=resource_counts,
         alert_counts=alert_counts,
         timestamp=datetime.now(timezone.utc).isoformat()
-    )
+    ).model_dump()
+    etag = _weak_etag({k: v for k, v in dashboard.items() if k != "timestamp"})
+    return _conditional_json(request, dashboard, etag)
 
 
 @router.get("/capacity-forecast")
@@ -449,7 +549,82 @@ async def capacity_forecast(
     return result
 
 
-@router.get("/metrics", response_model=List[MetricsResponse])
+# Loose index scan: one idx_metrics_raw_metric_ts seek per distinct name
+# instead of reading every row
+_DISTINCT_METRICS_QUERY = """
+    WITH RECURSIVE names(metric) AS (
+        SELECT MIN(metric) FROM metrics_raw
+        UNION ALL
+        SELECT (SELECT MIN(metric) FROM metrics_raw WHERE metric > names.metric)
+        FROM names WHERE names.metric IS NOT NULL
+    )
+    SELECT metric FROM names WHERE metric IS NOT NULL
+"""
+
+
+async def _distinct_metrics(db) -> List[str]:
+    """Sorted distinct metric names in metrics_raw."""
+    cursor = await db.execute(_DISTINCT_METRICS_QUERY)
+    return [row[0] for row in await cursor.fetchall()]
+
+
+# Rows pulled from the cursor per await while streaming a response
+_STREAM_FETCH_ROWS = 1000
+
+
+async def _stream_grouped_points(
+    sql: str,
+    params: tuple,
+    open_group: Callable[[str], bytes],
+    close_group: bytes,
+) -> AsyncIterator[bytes]:
+    """Stream (group, ts, value) rows ordered by group as comma-separated JSON
+    groups of {ts, value} points, one fetchmany batch per chunk."""
+    db = await get_telemetry_db()
+    current = None
+    async with db.execute(sql, params) as cursor:
+        while rows := await cursor.fetchmany(_STREAM_FETCH_ROWS):
+            chunk = []
+            # One orjson call per run of same-group rows, not one per row
+            for group, run in groupby(rows, key=itemgetter(0)):
+                if group != current:
+                    if current is not None:
+                        chunk.append(close_group + b",")
+                    chunk.append(open_group(group))
+                    current = group
+                else:
+                    chunk.append(b",")
+                chunk.append(orjson.dumps([{"ts": ts, "value": value} for _, ts, value in run])[1:-1])
+            yield b"".join(chunk)
+    if current is not None:
+        yield close_group
+
+
+async def _stream_series(sql: str, params: dict, metric_names: List[str]) -> AsyncIterator[bytes]:
+    """Stream the MetricsResponse list, one series per requested name.
+
+    sql selects (ts, value) rows for the :metric bound in turn to each name,
+    so every series is one indexed range scan and the response keeps request
+    order, duplicates included; names without rows come out as empty series.
+    """
+    db = await get_telemetry_db()
+    yield b"["
+    for index, metric_name in enumerate(metric_names):
+        yield (b"," if index else b"") + b'{"metric":' + orjson.dumps(metric_name) + b',"points":['
+        separator = b""
+        async with db.execute(sql, {**params, "metric": metric_name}) as cursor:
+            while rows := await cursor.fetchmany(_STREAM_FETCH_ROWS):
+                yield separator + orjson.dumps([{"ts": ts, "value": value} for ts, value in rows])[1:-1]
+                separator = b","
+        yield b"]}"
+    yield b"]"
+
+
+@router.get(
+    "/metrics",
+    response_model=None,
+    responses={200: {"model": List[MetricsResponse]}},
+)
 async def query_metrics(
     metrics: str = Query(..., description="Comma-separated metric names"),
     start: Optional[int] = Query(None, description="Start timestamp (epoch)"),
@@ -458,8 +633,6 @@ async def query_metrics(
     user: dict = Depends(get_current_user)
 ):
     """Query historical metrics."""
-    db = await get_telemetry_db()
-    
     now = int(time.time())
     start = start or (now - 3600)  # Default 1 hour
     end = end or now
@@ -468,39 +641,20 @@ async def query_metrics(
     if not metric_names:
         return []
 
-    results = []
-
-    placeholders = ",".join("?" for _ in metric_names)
+    params = {"step": step, "start": start, "end": end}
 
     if step > 1:
-        # One grouped query is cheaper than one query per metric.
-        cursor = await db.execute(
-            f"""SELECT metric, (ts / ?) * ? as bucket_ts, AVG(value)
+        sql = """SELECT (ts / :step) * :step as bucket_ts, AVG(value)
                 FROM metrics_raw
-                WHERE metric IN ({placeholders}) AND ts BETWEEN ? AND ?
-                GROUP BY metric, bucket_ts
-                ORDER BY metric, bucket_ts""",
-            (step, step, *metric_names, start, end)
-        )
+                WHERE metric = :metric AND ts BETWEEN :start AND :end
+                GROUP BY bucket_ts
+                ORDER BY bucket_ts"""
     else:
-        cursor = await db.execute(
-            f"""SELECT metric, ts, value FROM metrics_raw
-                WHERE metric IN ({placeholders}) AND ts BETWEEN ? AND ?
-                ORDER BY metric, ts""",
-            (*metric_names, start, end)
-        )
+        sql = """SELECT ts, value FROM metrics_raw
+                WHERE metric = :metric AND ts BETWEEN :start AND :end
+                ORDER BY ts"""
 
-    rows = await cursor.fetchall()
-    points_by_metric: Dict[str, List[MetricPoint]] = {name: [] for name in metric_names}
-    for row in rows:
-        metric_name = row[0]
-        if metric_name in points_by_metric:
-            points_by_metric[metric_name].append(MetricPoint(ts=row[1], value=row[2]))
-
-    for metric_name in metric_names:
-        results.append(MetricsResponse(metric=metric_name, points=points_by_metric.get(metric_name, [])))
-    
-    return results
+    return StreamingResponse(_stream_series(sql, params, metric_names), media_type="application/json")
 
 
 class MetricsQueryBody(BaseModel):
@@ -510,7 +664,11 @@ class MetricsQueryBody(BaseModel):
     step: int = 60
 
 
-@router.post("/metrics/query", response_model=List[MetricsResponse])
+@router.post(
+    "/metrics/query",
+    response_model=None,
+    responses={200: {"model": List[MetricsResponse]}},
+)
 async def query_metrics_post(
     query: MetricsQueryBody,
     user: dict = Depends(get_current_user)
@@ -555,7 +713,11 @@ async def get_metric_summary(
         count=row[3]
     )
 
-@router.get("/metrics/series", response_model=List[MetricsResponse])
+@router.get(
+    "/metrics/series",
+    response_model=None,
+    responses={200: {"model": List[MetricsResponse]}},
+)
 async def get_metric_series(
     metrics: str = Query(..., description="Comma-separated metric names"),
     start: Optional[int] = Query(None, description="Start timestamp (epoch)"),
@@ -564,8 +726,6 @@ async def get_metric_series(
     user: dict = Depends(get_current_user)
 ):
     """Get summarized historical time-series data."""
-    db = await get_telemetry_db()
-    
     now = int(time.time())
     start = start or (now - 86400 * 7)  # Default 7 days
     end = end or now
@@ -574,41 +734,27 @@ async def get_metric_series(
     if not metric_names:
         return []
 
-    results = []
-
-    placeholders = ",".join("?" for _ in metric_names)
+    params = {"step": step, "start": start, "end": end}
 
     if step > 1:
-        cursor = await db.execute(
-            f"""SELECT metric, (ts / ?) * ? as bucket_ts, AVG(avg)
+        sql = """SELECT (ts / :step) * :step as bucket_ts, AVG(avg)
                FROM metrics_summary
-               WHERE metric IN ({placeholders}) AND ts BETWEEN ? AND ?
-               GROUP BY metric, bucket_ts
-               ORDER BY metric, bucket_ts""",
-            (step, step, *metric_names, start, end)
-        )
+               WHERE metric = :metric AND ts BETWEEN :start AND :end
+               GROUP BY bucket_ts
+               ORDER BY bucket_ts"""
     else:
-        cursor = await db.execute(
-            f"""SELECT metric, ts, avg FROM metrics_summary
-               WHERE metric IN ({placeholders}) AND ts BETWEEN ? AND ?
-               ORDER BY metric, ts""",
-            (*metric_names, start, end)
-        )
-
-    rows = await cursor.fetchall()
-    points_by_metric: Dict[str, List[MetricPoint]] = {name: [] for name in metric_names}
-    for row in rows:
-        metric_name = row[0]
-        if metric_name in points_by_metric:
-            points_by_metric[metric_name].append(MetricPoint(ts=row[1], value=row[2]))
+        sql = """SELECT ts, avg FROM metrics_summary
+               WHERE metric = :metric AND ts BETWEEN :start AND :end
+               ORDER BY ts"""
 
-    for metric_name in metric_names:
-        results.append(MetricsResponse(metric=metric_name, points=points_by_metric.get(metric_name, [])))
-    
-    return results
+    return StreamingResponse(_stream_series(sql, params, metric_names), media_type="application/json")
 
 
-@router.post("/metrics/series/query", response_model=List[MetricsResponse])
+@router.post(
+    "/metrics/series/query",
+    response_model=None,
+    responses={200: {"model": List[MetricsResponse]}},
+)
 async def get_metric_series_post(
     query: MetricsQueryBody,
     user: dict = Depends(get_current_user)
@@ -624,18 +770,14 @@ async def get_metric_series_post(
 
 
 @router.get("/metrics/available")
-async def list_available_metrics(user: dict = Depends(get_current_user)):
+async def list_available_metrics(request: Request, user: dict = Depends(get_current_user)):
     """List all available metric names."""
     db = await get_telemetry_db()
-    
-    cursor = await db.execute(
-        "SELECT DISTINCT metric FROM metrics_raw ORDER BY metric"
-    )
-    rows = await cursor.fetchall()
+    metrics = await _distinct_metrics(db)
     
     # Group by category
     categories = {}
-    for (metric,) in rows:
+    for metric in metrics:
         parts = metric.split(".")
         category = parts[0] if len(parts) > 1 else "other"
         
@@ -643,44 +785,56 @@ async def list_available_metrics(user: dict = Depends(get_current_user)):
             categories[category] = []
         categories[category].append(metric)
     
-    return {
-        "total": len(rows),
-        "categories": categories
-    }
+    return _conditional_json(
+        request,
+        {"total": len(metrics), "categories": categories},
+        _weak_etag(metrics),
+    )
 
 
 @router.get("/history/{resource_id}")
 async def get_resource_history(
     resource_id: str,
     hours: int = Query(24, ge=1, le=168),
+    step: Optional[int] = Query(None, ge=1, description="Average into buckets of this many seconds"),
     user: dict = Depends(get_current_user)
 ):
     """Get telemetry history for a specific resource."""
-    db = await get_telemetry_db()
-    
     start = int(time.time()) - (hours * 3600)
     
-    # Get metrics that match the resource
-    cursor = await db.execute(
-        """SELECT metric, ts, value FROM metrics_raw
-           WHERE metric LIKE ? AND ts >= ?
-           ORDER BY ts""",
-        (f"%{resource_id}%", start)
-    )
-    rows = await cursor.fetchall()
-    
-    # Group by metric
-    metrics = {}
-    for metric, ts, value in rows:
-        if metric not in metrics:
-            metrics[metric] = []
-        metrics[metric].append({"ts": ts, "value": value})
-    
-    return {
-        "resource_id": resource_id,
-        "hours": hours,
-        "metrics": metrics
-    }
+    # Resolve matching metric names first so the row query is an index range
+    # scan per name instead of a LIKE '%...%' scan over every row
+    needle = resource_id.lower()
+    db = await get_telemetry_db()
+    matched = [metric for metric in await _distinct_metrics(db) if needle in metric.lower()]
+    placeholders = ",".join("?" for _ in matched) or "NULL"
+
+    if step and step > 1:
+        sql = f"""SELECT metric, (ts / ?) * ? AS bucket_ts, AVG(value)
+               FROM metrics_raw
+               WHERE metric IN ({placeholders}) AND ts >= ?
+               GROUP BY metric, bucket_ts
+               ORDER BY metric, bucket_ts"""
+        params = (step, step, *matched, start)
+    else:
+        sql = f"""SELECT metric, ts, value FROM metrics_raw
+               WHERE metric IN ({placeholders}) AND ts >= ?
+               ORDER BY metric, ts"""
+        params = (*matched, start)
+
+    async def stream():
+        # Grouped by metric: {"metrics": {"<metric>": [{ts, value}, ...]}}
+        yield (
+            b'{"resource_id":' + orjson.dumps(resource_id)
+            + b',"hours":' + orjson.dumps(hours) + b',"metrics":{'
+        )
+        async for chunk in _stream_grouped_points(
+            sql, params, lambda metric: orjson.dumps(metric) + b":[", b"]"
+        ):
+            yield chunk
+        yield b"}}"
+
+    return StreamingResponse(stream(), media_type="application/json")
 
 
 @router.post("/retention/cleanup")
@@ -688,7 +842,7 @@ async def cleanup_old_data(
     user: dict = Depends(get_current_user)
 ):
     """Manually trigger data cleanup based on retention policies."""
-    from config import settings
+    # Imported here: the backup service pulls in the Drive/crypto stack
     from services.gdrive_backup import backup_service
 
     db = await get_telemetry_db()
@@ -698,13 +852,7 @@ async def cleanup_old_data(
     retention_result = await backup_service.enforce_retention()
 
     # Delete old summaries
-    cursor = await db.execute(
-        "DELETE FROM metrics_summary WHERE ts < ?",
-        (summary_cutoff,)
-    )
-    summary_deleted = cursor.rowcount
-
-    await db.commit()
+    summary_deleted = await delete_in_batches(db, "metrics_summary", "ts < ?", (summary_cutoff,))
 
     return {
         "raw_deleted": retention_result["telemetry"]["deleted_rows"],
@@ -16,7 +16,6 @@ Security features:
 import asyncio
 import os
 import pty
-import select
 import signal
 import struct
 import fcntl
@@ -26,18 +25,53 @@ import re
 import secrets
 import shlex
 import hashlib
+import json
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, Dict, Tuple
 
+import structlog
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Request
 from pydantic import BaseModel
+import pyotp
 
 from config import settings
 from db import get_control_db
+from services.audit_writer import audit_writer
 from .auth import _validate_token, require_role, get_current_user, verify_password_async
+from .network import _read_default_gateways
 from time_utils import utc_now
 
 router = APIRouter()
+logger = structlog.get_logger(__name__)
+
+# Bytes requested per PTY read. The tty layer hands over at most its 4 KiB
+# line buffer per read, so asking for more only allocates a bigger temporary;
+# bulk output is batched by draining instead
+PTY_READ_CHUNK = 4 * 1024
+# Most bytes drained per readiness callback, so a shell that never stops
+# writing cannot hold the event loop
+PTY_DRAIN_LIMIT = 256 * 1024
+# Output arriving within this window of the last flush goes out as one
+# WebSocket frame; output after a quiet spell (e.g. a keystroke echo) is
+# flushed at once
+PTY_COALESCE_SECONDS = 0.005
+# Pending output at which the window is cut short
+PTY_COALESCE_LIMIT = 256 * 1024
+# Full-mode stdin arrives as binary frames; text frames are control
+# messages, and those starting with this carry a terminal resize
+RESIZE_PREFIX = "R\t"
+# Frames buffered per client before a slow client is dropped
+SUBSCRIBER_QUEUE_SIZE = 64
+# Most client input held while the PTY is not accepting more
+PTY_INPUT_LIMIT = 1024 * 1024
+# Time a shell gets to exit after SIGTERM before it is killed
+SHELL_EXIT_GRACE_SECONDS = 2.0
+# Most recent output replayed on reattach; a power of two so wrapping is a mask
+HISTORY_CAPACITY = 128 * 1024
+HISTORY_MASK = HISTORY_CAPACITY - 1
+# Shown to every client when a session is closed for inactivity
+IDLE_TIMEOUT_MESSAGE = b"\r\n\x1b[33m[Session timed out due to inactivity]\x1b[0m\r\n"
 
 
 # ============================================================================
@@ -89,6 +123,10 @@ class CommandResponse(BaseModel):
 # Audit Logging Helper
 # ============================================================================
 
+# Committed before the request continues; other terminal events are batched
+IMMEDIATE_AUDIT_EVENTS = frozenset({"breakglass_open", "breakglass_close", "breakglass_failed"})
+
+
 async def log_terminal_event(
     event_type: str,
     user_id: int,
@@ -98,6 +136,9 @@ async def log_terminal_event(
     resource_id: Optional[str] = None
 ):
     """Log terminal-related events to audit log."""
+    if event_type not in IMMEDIATE_AUDIT_EVENTS:
+        audit_writer.enqueue(user_id, event_type, resource_id, details, ip_address)
+        return
     db = await get_control_db()
     await db.execute(
         """INSERT INTO audit_log (user_id, action, resource_id, details, ip_address)
@@ -121,14 +162,27 @@ def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
 
+# Open break-glass sessions already validated: token_hash -> (user_id, expires_at).
+# Every close goes through close_breakglass_session, which evicts the user's entries.
+_breakglass_cache: Dict[str, Tuple[int, datetime]] = {}
+# Closes committed per user; a validation that overlapped one is not cached
+_breakglass_closes: Dict[int, int] = {}
+
+
 async def validate_breakglass_token(token: str, user_id: int) -> bool:
     """Validate a break-glass token for a user."""
     if not token:
         return False
     
-    db = await get_control_db()
     token_hash = hash_token(token)
+    cached = _breakglass_cache.get(token_hash)
+    if cached and utc_now() <= cached[1]:
+        return cached[0] == user_id
+    # Expired entries fall through so the session is closed below
+    _breakglass_cache.pop(token_hash, None)
+    closes = _breakglass_closes.get(user_id, 0)
     
+    db = await get_control_db()
     cursor = await db.execute(
         """SELECT id, expires_at, closed_at FROM breakglass_sessions 
            WHERE token_hash = ? AND user_id = ? AND closed_at IS NULL""",
@@ -152,6 +206,9 @@ async def validate_breakglass_token(token: str, user_id: int) -> bool:
         await db.commit()
         return False
     
+    # A close that committed while we awaited may have read an older row
+    if _breakglass_closes.get(user_id, 0) == closes:
+        _breakglass_cache[token_hash] = (user_id, expires_at)
     return True
 
 
@@ -165,6 +222,11 @@ async def close_breakglass_session(user_id: int, reason: str = "manual_close"):
         (utc_now().isoformat(), reason, user_id)
     )
     await db.commit()
+    # Bumped after the commit, so any validation that may have read the
+    # row as open sees the change and does not cache it
+    _breakglass_closes[user_id] = _breakglass_closes.get(user_id, 0) + 1
+    for token_hash in [h for h, (owner, _) in _breakglass_cache.items() if owner == user_id]:
+        del _breakglass_cache[token_hash]
 
 
 # ============================================================================
@@ -216,7 +278,6 @@ async def start_breakglass(
         if not request.totp_code:
             raise HTTPException(status_code=401, detail="TOTP code required")
         
-        import pyotp
         totp = pyotp.TOTP(totp_secret)
         if not totp.verify(request.totp_code):
             await log_terminal_event(
@@ -240,7 +301,6 @@ async def start_breakglass(
     expires_at = issued_at + timedelta(minutes=ttl_minutes)
     
     # Store session
-    import uuid
     session_id = str(uuid.uuid4())
     
     await db.execute(
@@ -336,6 +396,8 @@ async def stop_breakglass(
 
 # Command validation patterns
 BLOCKED_PATTERNS = [";", "|", "&", "`", "$(", ">", "<", ">>", "<<", "\n", "\r"]
+# All blocked patterns in one alternation, so a command is scanned once
+BLOCKED_PATTERN_RE = re.compile("|".join(map(re.escape, BLOCKED_PATTERNS)))
 SERVICE_REGEX = re.compile(r'^[a-zA-Z0-9_.-]+$')
 
 
@@ -345,9 +407,9 @@ def validate_restricted_command(command: str) -> tuple[bool, str]:
     Returns (is_valid, error_message).
     """
     # Check for blocked patterns (shell metacharacters)
-    for pattern in BLOCKED_PATTERNS:
-        if pattern in command:
-            return False, f"Blocked pattern detected: {pattern}"
+    blocked = BLOCKED_PATTERN_RE.search(command)
+    if blocked:
+        return False, f"Blocked pattern detected: {blocked.group(0)}"
     
     # Get allowed commands from settings
     allowed = settings.terminal_allowed_commands_list
@@ -453,6 +515,16 @@ async def execute_restricted_command(
 # Full PTY Terminal Session (Break-Glass Required)
 # ============================================================================
 
+def _default_gateway() -> str:
+    """First IPv4 default gateway from the routing table, else "host.internal"."""
+    return next(iter(_read_default_gateways().values()), "host.internal")
+
+
+def _binary_message(data: bytes) -> dict:
+    """The ASGI message WebSocket.send_bytes would build for data."""
+    return {"type": "websocket.send", "bytes": data}
+
+
 class TerminalSession:
     """Manages a persistent PTY terminal session."""
     
@@ -463,13 +535,25 @@ class TerminalSession:
         self.fd: Optional[int] = None
         self.pid: Optional[int] = None
         self.running = False
-        self.websockets: List[WebSocket] = []
-        # Circular buffer for history (store last ~100KB of output)
-        from collections import deque
-        self.history = deque(maxlen=100)
-        self.history_bytes = 0
-        self.max_history_bytes = 100 * 1024  # 100KB
+        # Outbound ASGI messages per client, each drained by its own _sender
+        # task; None tells the sender to stop
+        self.subscribers: Dict[WebSocket, asyncio.Queue] = {}
+        self._senders: Dict[WebSocket, asyncio.Task] = {}
+        # Ring buffer holding the last HISTORY_CAPACITY bytes of output
+        self._history = bytearray(HISTORY_CAPACITY)
+        self._history_head = 0
+        self._history_full = False
         self.read_task: Optional[asyncio.Task] = None
+        # PTY output handed from the reader callback to _read_loop; None ends it
+        self._output: asyncio.Queue = asyncio.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Output read but not yet flushed to history and _output
+        self._pending = bytearray()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._last_flush = 0.0
+        # Input accepted from clients but not yet taken by the PTY
+        self._input = bytearray()
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
         self.last_activity = time.time()
         self.idle_timeout = settings.terminal_idle_timeout_sec
     
@@ -497,6 +581,10 @@ class TerminalSession:
                 "Set TERMINAL_HOST_SSH_ENABLED=true and configure SSH key auth."
             )
 
+        use_host_ssh = in_container and settings.terminal_host_ssh_enabled
+        # Resolved before forking so the child only has to exec
+        gateway = _default_gateway() if use_host_ssh else None
+
         # Fork a pseudo-terminal
         self.pid, self.fd = pty.fork()
         
@@ -505,18 +593,8 @@ class TerminalSession:
             os.environ["TERM"] = "xterm-256color"
             os.environ["COLORTERM"] = "truecolor"
             
-            if in_container and settings.terminal_host_ssh_enabled:
+            if use_host_ssh:
                 # Container mode: SSH to host (SSH key auth required)
-                import subprocess
-                try:
-                    result = subprocess.run(
-                        ["ip", "route", "show", "default"],
-                        capture_output=True, text=True
-                    )
-                    gateway = result.stdout.split()[2] if result.stdout else "host.internal"
-                except Exception:
-                    gateway = "host.internal"
-                
                 # Get SSH credentials from environment - NO DEFAULTS
                 ssh_user = os.environ.get("SSH_HOST_USER")
                 ssh_key_path = os.environ.get("SSH_HOST_KEY_PATH")
@@ -552,23 +630,54 @@ class TerminalSession:
             flags = fcntl.fcntl(self.fd, fcntl.F_GETFL)
             fcntl.fcntl(self.fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
             
-            # Start background reader task
-            self.read_task = asyncio.create_task(self._read_loop())
+            self._start_reader()
     
-    async def connect(self, websocket: WebSocket):
-        """Connect a new WebSocket to this session."""
-        self.websockets.append(websocket)
-        # Replay history
-        try:
-            for chunk in self.history:
-                await websocket.send_bytes(chunk)
-        except Exception as e:
-            print(f"Error replaying history: {e}")
+    def _start_reader(self):
+        """Watch the PTY for output on the event loop and start broadcasting it."""
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self.fd, self._on_pty_readable)
+        self._idle_handle = self._loop.call_later(self.idle_timeout, self._check_idle)
+        self.read_task = asyncio.create_task(self._read_loop())
+    
+    async def connect(self, websocket: WebSocket, ready: Optional[dict] = None):
+        """Connect a new WebSocket to this session.
+
+        History and then the optional ready frame are queued ahead of any new
+        output, so the client's sender stays the only writer on the socket.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        # Replay history ahead of any new output, as one frame
+        history = self.history()
+        if history:
+            queue.put_nowait(_binary_message(history))
+        if ready is not None:
+            queue.put_nowait({"type": "websocket.send", "text": json.dumps(ready)})
+        self.subscribers[websocket] = queue
+        self._senders[websocket] = asyncio.create_task(self._sender(websocket, queue))
             
     def disconnect(self, websocket: WebSocket):
         """Disconnect a WebSocket."""
-        if websocket in self.websockets:
-            self.websockets.remove(websocket)
+        self.subscribers.pop(websocket, None)
+        sender = self._senders.pop(websocket, None)
+        if sender and sender is not asyncio.current_task():
+            sender.cancel()
+    
+    async def _sender(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Deliver one client's frames in order, at that client's pace."""
+        try:
+            while (message := await queue.get()) is not None:
+                await websocket.send(message)
+        except Exception as e:
+            logger.warning("Terminal send error", session_id=self.session_id, error=str(e))
+        self.disconnect(websocket)
+    
+    async def _drop_slow_client(self, websocket: WebSocket):
+        """Disconnect a client that fell a full queue behind."""
+        self.disconnect(websocket)
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
             
     def resize(self, cols: int, rows: int):
         """Resize the terminal."""
@@ -579,65 +688,112 @@ class TerminalSession:
             except OSError:
                 pass
     
-    def is_idle_timeout(self) -> bool:
-        """Check if session has exceeded idle timeout."""
-        return (time.time() - self.last_activity) > self.idle_timeout
+    def _check_idle(self):
+        """Timer callback: end the session once the idle deadline has passed.
+        
+        Activity only moves last_activity; the timer re-arms itself for the
+        remaining time rather than being reset on every read or write.
+        """
+        remaining = self.last_activity + self.idle_timeout - time.time()
+        if remaining > 0:
+            self._idle_handle = self._loop.call_later(remaining, self._check_idle)
+            return
+        self._idle_handle = None
+        self._output.put_nowait(IDLE_TIMEOUT_MESSAGE)
+        self._output.put_nowait(None)
     
-    async def _read_loop(self):
-        """Read output from PTY and broadcast to WebSockets."""
-        while self.running:
+    def _on_pty_readable(self):
+        """Event-loop callback: collect whatever the PTY has ready for _flush."""
+        drained = 0
+        eof = False
+        while drained < PTY_DRAIN_LIMIT:
             try:
-                # Check idle timeout
-                if self.is_idle_timeout():
-                    # Send timeout message
-                    timeout_msg = b"\r\n\x1b[33m[Session timed out due to inactivity]\x1b[0m\r\n"
-                    for ws in self.websockets:
-                        try:
-                            await ws.send_bytes(timeout_msg)
-                        except:
-                            pass
-                    break
-                
-                # Check if data available
-                r, _, _ = select.select([self.fd], [], [], 0.1)
-                
-                if self.fd in r:
-                    try:
-                        output = os.read(self.fd, 4096)
-                        if output:
-                            # Update activity
-                            self.last_activity = time.time()
-                            
-                            # Add to buffer (with size limit)
-                            if self.history_bytes < self.max_history_bytes:
-                                self.history.append(output)
-                                self.history_bytes += len(output)
-                            
-                            # Broadcast to all connected clients
-                            disconnected = []
-                            for ws in self.websockets:
-                                try:
-                                    await ws.send_bytes(output)
-                                except Exception:
-                                    disconnected.append(ws)
-                            
-                            # Cleanup disconnected
-                            for ws in disconnected:
-                                self.disconnect(ws)
-                        else:
-                            # EOF (Shell exited)
-                            break
-                    except OSError:
-                        break
-                
-                await asyncio.sleep(0.01)
-                
-            except Exception as e:
-                print(f"Terminal read error: {e}")
+                chunk = os.read(self.fd, PTY_READ_CHUNK)
+            except BlockingIOError:
+                break
+            except OSError:
+                # EIO once the shell has exited
+                chunk = b""
+            if not chunk:
+                eof = True
                 break
+            self._pending += chunk
+            drained += len(chunk)
+        
+        if drained:
+            # Update activity
+            self.last_activity = time.time()
+        
+        if eof:
+            # EOF: stop watching and let _read_loop flush and clean up
+            self._loop.remove_reader(self.fd)
+            self._flush()
+            self._output.put_nowait(None)
+        elif len(self._pending) >= PTY_COALESCE_LIMIT:
+            self._flush()
+        elif self._pending and self._flush_handle is None:
+            if self._loop.time() - self._last_flush >= PTY_COALESCE_SECONDS:
+                self._flush()
+            else:
+                self._flush_handle = self._loop.call_later(PTY_COALESCE_SECONDS, self._flush)
+    
+    def _flush(self):
+        """Hand output collected during the coalescing window to _read_loop."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        self._last_flush = self._loop.time()
+        output = bytes(self._pending)
+        self._pending.clear()
+        
+        self._record_history(output)
+        self._output.put_nowait(output)
+    
+    def _record_history(self, data: bytes):
+        """Append to the history ring, overwriting the oldest bytes."""
+        view = memoryview(data)[-HISTORY_CAPACITY:]
+        size = len(view)
+        head = self._history_head
+        first = min(size, HISTORY_CAPACITY - head)
+        self._history[head:head + first] = view[:first]
+        self._history[:size - first] = view[first:]
+        if head + size >= HISTORY_CAPACITY:
+            self._history_full = True
+        self._history_head = (head + size) & HISTORY_MASK
+    
+    def history(self) -> bytes:
+        """Recorded output, oldest first."""
+        head = self._history_head
+        # Views keep this to the single copy made by join
+        view = memoryview(self._history)
+        if self._history_full:
+            return b"".join((view[head:], view[:head]))
+        return bytes(view[:head])
+    
+    async def _read_loop(self):
+        """Broadcast queued PTY output to WebSockets until EOF, stop() or idle timeout."""
+        while (output := await self._output.get()) is not None:
+            self._broadcast(output)
         
         # Cleanup when shell exits
-        self.stop()
+        await self.stop()
+    
+    def _broadcast(self, data: bytes):
+        """Queue a frame for every client without waiting on any of them.
+        
+        A client whose queue is full is dropped rather than allowed to hold
+        up the others.
+        """
+        # One ASGI message shared by every client instead of one per send_bytes
+        message = _binary_message(data)
+        for websocket, queue in list(self.subscribers.items()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                del self.subscribers[websocket]
+                asyncio.create_task(self._drop_slow_client(websocket))
     
     async def write_input(self, data: bytes):
         """Write input to PTY with size limit."""
@@ -645,30 +801,73 @@ class TerminalSession:
             # Enforce message size limit
             if len(data) > settings.terminal_max_message_size:
                 data = data[:settings.terminal_max_message_size]
-            try:
-                self.last_activity = time.time()
-                os.write(self.fd, data)
-            except OSError as e:
-                print(f"Terminal write error: {e}")
+            self.last_activity = time.time()
+            if len(self._input) + len(data) > PTY_INPUT_LIMIT:
+                logger.warning(
+                    "Terminal input dropped: shell is not reading",
+                    session_id=self.session_id,
+                    pending=len(self._input),
+                )
+                return
+            # Queue behind input the PTY has not taken yet, else write now
+            waiting = bool(self._input)
+            self._input += data
+            if not waiting:
+                self._write_pending_input()
     
-    def stop(self):
+    def _write_pending_input(self):
+        """Write as much queued input as the PTY accepts.
+        
+        Whatever it refuses is sent once the fd is writable again, not dropped.
+        """
+        try:
+            while self._input:
+                written = os.write(self.fd, self._input)
+                del self._input[:written]
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            logger.warning("Terminal write error", session_id=self.session_id, error=str(e))
+            self._input.clear()
+        if self._input:
+            self._loop.add_writer(self.fd, self._write_pending_input)
+        else:
+            self._loop.remove_writer(self.fd)
+    
+    async def stop(self):
         """Stop the terminal session."""
         self.running = False
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        # Wake _read_loop so it exits
+        self._output.put_nowait(None)
         
-        # Close all websockets
-        self.websockets.clear()
+        # Let each sender deliver what is already queued, then finish
+        for websocket, queue in list(self.subscribers.items()):
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                self.disconnect(websocket)
+        self.subscribers.clear()
         
         # Kill process
-        if self.pid:
+        pid, self.pid = self.pid, None
+        if pid:
             try:
-                os.kill(self.pid, signal.SIGTERM)
-                os.waitpid(self.pid, 0)
-            except (OSError, ChildProcessError):
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
                 pass
-            self.pid = None
         
         # Close FD
         if self.fd:
+            if self._loop:
+                self._loop.remove_reader(self.fd)
+                self._loop.remove_writer(self.fd)
+            self._input.clear()
             try:
                 os.close(self.fd)
             except OSError:
@@ -678,6 +877,26 @@ class TerminalSession:
         # Remove from global sessions
         if self.session_id in active_sessions:
             del active_sessions[self.session_id]
+        
+        if pid:
+            await self._reap(pid)
+    
+    @staticmethod
+    async def _reap(pid: int):
+        """Wait for the shell to exit without blocking the event loop.
+        
+        Sends SIGKILL if it is still running after SHELL_EXIT_GRACE_SECONDS.
+        """
+        deadline = time.monotonic() + SHELL_EXIT_GRACE_SECONDS
+        killed = False
+        try:
+            while os.waitpid(pid, os.WNOHANG)[0] == 0:
+                if not killed and time.monotonic() >= deadline:
+                    os.kill(pid, signal.SIGKILL)
+                    killed = True
+                await asyncio.sleep(0.05)
+        except ChildProcessError:
+            pass
 
 
 # Store active sessions: session_id -> TerminalSession
@@ -699,6 +918,7 @@ async def terminal_websocket(websocket: WebSocket):
     
     session: Optional[TerminalSession] = None
     user_info = None
+    mode = "unknown"
     
     try:
         # Wait for handshake
@@ -764,54 +984,38 @@ async def terminal_websocket(websocket: WebSocket):
                 session.resize(cols, rows)
             else:
                 # Create new session
-                import uuid
                 new_session_id = requested_session_id or str(uuid.uuid4())
                 session = TerminalSession(new_session_id, user_info["id"], user_info["username"])
                 active_sessions[new_session_id] = session
                 await session.start(cols, rows)
             
-            # Connect this websocket to the session
-            await session.connect(websocket)
-            
-            # Send ready signal
-            await websocket.send_json({
+            # Connect this websocket to the session; the ready signal follows
+            # the history replay through the client's own sender
+            await session.connect(websocket, ready={
                 "status": "connected",
                 "mode": "full",
                 "session_id": session.session_id
             })
             
-            # Handle incoming data
+            # Handle incoming data; idleness is enforced by the session
+            # itself and keepalive by the server's websocket pings
             while True:
-                try:
-                    message = await asyncio.wait_for(
-                        websocket.receive(),
-                        timeout=60.0
-                    )
-                    
-                    if message["type"] == "websocket.receive":
-                        if "bytes" in message:
-                            await session.write_input(message["bytes"])
-                        elif "text" in message:
-                            data = message["text"]
-                            # Check for resize command
-                            if data.startswith('{"resize":'):
-                                import json
-                                try:
-                                    resize_data = json.loads(data)
-                                    if "resize" in resize_data:
-                                        session.resize(
-                                            resize_data["resize"]["cols"],
-                                            resize_data["resize"]["rows"]
-                                        )
-                                except:
-                                    pass
-                            else:
-                                await session.write_input(data.encode())
-                                
-                except asyncio.TimeoutError:
-                    pass
-                except WebSocketDisconnect:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
                     break
+                if "bytes" in message:
+                    await session.write_input(message["bytes"])
+                elif "text" in message:
+                    # Text frames are control messages, never stdin; any
+                    # besides resize (e.g. the UI heartbeat ping) are dropped
+                    data = message["text"]
+                    # Resize command: "R\t<cols>\t<rows>"
+                    if data.startswith(RESIZE_PREFIX):
+                        try:
+                            _, cols, rows = data.split("\t")
+                            session.resize(int(cols), int(rows))
+                        except (ValueError, struct.error):
+                            pass
         
         elif mode == "restricted":
             # Restricted mode - command execution only (no PTY)
@@ -880,15 +1084,19 @@ async def terminal_websocket(websocket: WebSocket):
                 
     except WebSocketDisconnect:
         pass
-    except Exception as e:
-        print(f"Terminal WebSocket error: {e}")
+    except Exception:
+        logger.exception(
+            "Terminal WebSocket error",
+            mode=mode,
+            session_id=session.session_id if session else None,
+        )
     finally:
         # Log disconnect
         if user_info:
             await log_terminal_event(
                 "terminal_disconnect",
                 user_info["id"],
-                details=f"Mode: {mode if 'mode' in dir() else 'unknown'}"
+                details=f"Mode: {mode}"
             )
         
         if session:
@@ -184,17 +184,21 @@ class AgentClient:
         action: str,
         params: Dict = None,
         timeout: float = 90.0,
+        action_timeout: Optional[float] = None,
     ) -> Dict:
-        """Execute action on a resource."""
-        return await self.call(
-            "resource.action",
-            {
-                "resource_id": resource_id,
-                "action": action,
-                "params": params or {},
-            },
-            timeout=timeout,
-        )
+        """Execute action on a resource.
+        
+        action_timeout is enforced by the agent, which answers with a TIMEOUT
+        error; timeout only bounds the RPC and should stay well above it.
+        """
+        rpc_params = {
+            "resource_id": resource_id,
+            "action": action,
+            "params": params or {},
+        }
+        if action_timeout is not None:
+            rpc_params["timeout"] = action_timeout
+        return await self.call("resource.action", rpc_params, timeout=timeout)
 
     async def execute_action(
         self,
@@ -202,6 +206,7 @@ class AgentClient:
         action: str,
         params: Dict = None,
         timeout: float = 90.0,
+        action_timeout: Optional[float] = None,
     ) -> Dict:
         """Backward-compatible alias for resource actions."""
         return await self.resource_action(
@@ -209,6 +214,7 @@ class AgentClient:
             action=action,
             params=params,
             timeout=timeout,
+            action_timeout=action_timeout,
         )
     
     async def get_resource_logs(self, resource_id: str, tail: int = 100) -> list:
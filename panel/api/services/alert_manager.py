@@ -4,6 +4,7 @@ import logging
 import uuid
 
 from db import get_control_db
+from services.dashboard_counts import dashboard_counts
 from services.agent_client import agent_client
 from services.sse import sse_manager, Channels
 from services.notification_service import notification_service
@@ -125,6 +126,7 @@ class AlertManager:
             (alert_id, rule_id, severity, message, value, now)
         )
         await db.commit()
+        dashboard_counts.invalidate()
         
         # Broadcast
         await sse_manager.broadcast(Channels.ALERTS, "alert_fired", {
@@ -162,6 +164,7 @@ class AlertManager:
                 (alert_id,)
             )
             await db.commit()
+            dashboard_counts.invalidate()
             
             await sse_manager.broadcast(Channels.ALERTS, "alert_resolved", {"alert_id": alert_id})
             await notification_service.resolve_dedupe(f"alert:{rule_id}")
@@ -0,0 +1,85 @@
+"""Batch audit log inserts off the request path."""
+
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+import structlog
+
+from db import get_control_db
+
+
+logger = structlog.get_logger(__name__)
+
+_STOP = object()
+
+AuditEntry = Tuple[Optional[int], str, Optional[str], Optional[str], Optional[str]]
+
+
+class AuditWriter:
+    """Queue audit entries and insert them with one commit per batch."""
+
+    def __init__(self, batch_size: int = 50, flush_interval: float = 0.2):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(
+        self,
+        user_id: Optional[int],
+        action: str,
+        resource_id: Optional[str] = None,
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> None:
+        self._queue.put_nowait((user_id, action, resource_id, details, ip_address))
+
+    async def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Flush everything queued so far, then stop the writer."""
+        if self._task:
+            self._queue.put_nowait(_STOP)
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            entry = await self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            except Exception as exc:
+                logger.error("Audit batch write failed", error=str(exc), dropped=len(batch))
+
+    async def _write(self, batch: List[AuditEntry]) -> None:
+        if not batch:
+            return
+        db = await get_control_db()
+        await db.executemany(
+            """INSERT INTO audit_log (user_id, action, resource_id, details, ip_address)
+               VALUES (?, ?, ?, ?, ?)""",
+            batch,
+        )
+        await db.commit()
+
+
+audit_writer = AuditWriter()
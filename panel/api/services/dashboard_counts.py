@@ -0,0 +1,65 @@
+"""Cache the dashboard's resource and alert counts between writes."""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from db import get_control_db
+
+
+Counts = Tuple[Dict[str, int], Dict[str, int]]
+
+
+class DashboardCounts:
+    """Managed resources per class and open alerts per severity.
+
+    Writers to the resources or alerts tables call invalidate(); a load that
+    overlaps an invalidation is served once but not kept.
+    """
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._version = 0
+        self._cached: Optional[Tuple[int, float, Counts]] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._version += 1
+
+    def _fresh(self) -> Optional[Counts]:
+        if self._cached:
+            version, expires_at, counts = self._cached
+            if version == self._version and time.monotonic() < expires_at:
+                return counts
+        return None
+
+    async def get(self) -> Counts:
+        counts = self._fresh()
+        if counts is not None:
+            return counts
+        # Concurrent misses wait for the first loader instead of re-querying
+        async with self._lock:
+            counts = self._fresh()
+            if counts is not None:
+                return counts
+            version = self._version
+            counts = await self._load()
+            self._cached = (version, time.monotonic() + self.ttl, counts)
+            return counts
+
+    async def _load(self) -> Counts:
+        db = await get_control_db()
+        cursor = await db.execute(
+            """SELECT class, COUNT(*) FROM resources
+               WHERE managed = 1 GROUP BY class"""
+        )
+        resource_counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        cursor = await db.execute(
+            """SELECT severity, COUNT(*) FROM alerts
+               WHERE state IN ('pending', 'firing') GROUP BY severity"""
+        )
+        alert_counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        return resource_counts, alert_counts
+
+
+dashboard_counts = DashboardCounts()
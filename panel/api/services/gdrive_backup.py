@@ -26,7 +26,7 @@ from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 from config import settings
-from db import get_control_db, get_telemetry_db
+from db import delete_in_batches, get_control_db, get_telemetry_db
 
 logger = structlog.get_logger(__name__)
 
@@ -571,12 +571,11 @@ class GDriveBackupService:
         start_ts = int(day_start.timestamp())
         end_ts = int(day_end.timestamp())
         if data_type == "telemetry":
-            cursor = await db.execute("DELETE FROM metrics_raw WHERE ts >= ? AND ts < ?", (start_ts, end_ts))
+            deleted = await delete_in_batches(db, "metrics_raw", "ts >= ? AND ts < ?", (start_ts, end_ts))
         else:
-            cursor = await db.execute("DELETE FROM iot_sensor_readings WHERE timestamp >= ? AND timestamp < ?", (start_ts, end_ts))
-        await db.commit()
+            deleted = await delete_in_batches(db, "iot_sensor_readings", "timestamp >= ? AND timestamp < ?", (start_ts, end_ts))
 
-        return {"status": "completed", "deleted_rows": cursor.rowcount or 0, "files": export_result.get("files", []), "errors": []}
+        return {"status": "completed", "deleted_rows": deleted, "files": export_result.get("files", []), "errors": []}
 
     async def _export_window(
         self,
@@ -6,10 +6,19 @@ Container mode: Uses SSH to connect to the host via the gateway IP.
 """
 
 import asyncio
+import signal
 import subprocess
 import os
 from typing import Tuple
 
+# Reuse one SSH connection to the host across commands; only the first call
+# pays for the TCP and SSH handshakes.
+SSH_CONTROL_OPTIONS = (
+    "-o", "ControlMaster=auto",
+    "-o", f"ControlPath={os.environ.get('SSH_CONTROL_PATH', '/tmp/pictl-%r@%h:%p')}",
+    "-o", "ControlPersist=10m",
+)
+
 
 def is_running_in_container() -> bool:
     """Check if running inside a container."""
@@ -85,6 +94,7 @@ def run_container_host_command(command: str, timeout: int = 30) -> Tuple[str, st
                 "LogLevel=ERROR",
                 "-o",
                 f"ConnectTimeout={min(timeout, 10)}",
+                *SSH_CONTROL_OPTIONS,
                 f"{ssh_user}@{gateway}",
                 command,
             ],
@@ -116,6 +126,43 @@ def run_host_command_simple(command: str, timeout: int = 30) -> str:
     return stdout if code == 0 else ""
 
 
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    """Kill the whole shell pipeline, not just the shell itself."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
 async def run_host_command_async(command: str, timeout: int = 30) -> str:
-    """Execute a command on host asynchronously and return stdout only."""
-    return await asyncio.to_thread(run_host_command_simple, command, timeout)
+    """
+    Execute a command on host asynchronously and return stdout only.
+
+    Native mode runs the command as an asyncio subprocess so the event loop
+    is never blocked; container mode still goes through SSH in a worker thread.
+    """
+    if is_running_in_container():
+        return await asyncio.to_thread(run_host_command_simple, command, timeout)
+
+    try:
+        proc = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return ""
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        _kill_process_group(proc)
+        await proc.wait()
+        return ""
+    except asyncio.CancelledError:
+        # The caller is gone; do not leave the pipeline running behind it.
+        # SIGKILL makes the reap immediate, so waiting here cannot stall
+        _kill_process_group(proc)
+        await proc.wait()
+        raise
+    return stdout.decode(errors="replace") if proc.returncode == 0 else ""
@@ -0,0 +1,28 @@
+"""Read small host files for the system and telemetry routers.
+
+Files that cannot change while the host is up (hostname, os-release,
+cpuinfo, kernel version) are read once per process and shared by both.
+"""
+
+import os
+from functools import lru_cache
+
+
+def read_small(path: str, size: int = 4096) -> bytes:
+    """Read up to `size` bytes of a small system file in one syscall; b"" on error."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return b""
+    try:
+        return os.read(fd, size)
+    except OSError:
+        return b""
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=None)
+def read_static(path: str) -> bytes:
+    """read_small for a file that is fixed while the host is up, memoized by path."""
+    return read_small(path, 65536)
@@ -0,0 +1,119 @@
+"""Sample processes in the background so CPU percentages are meaningful.
+
+psutil reports a process's CPU use relative to the previous sample of the
+same Process object; process_iter keeps those objects between calls, so a
+steady sampler yields real percentages instead of 0.0. That also makes the
+sampler the only safe cpu_percent consumer: any other caller would reset
+its baseline, so per-unit usage for discovery and the host-wide CPU figure
+are derived here too.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+import structlog
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+logger = structlog.get_logger(__name__)
+
+
+def _unit_from_cgroup(pid: int) -> Optional[str]:
+    """Return the systemd service a process runs under, from /proc/<pid>/cgroup."""
+    try:
+        with open(f"/proc/{pid}/cgroup", "r") as f:
+            content = f.read()
+    except OSError:
+        return None
+    for line in content.splitlines():
+        # hierarchy-ID:controllers:path, e.g. 0::/system.slice/nginx.service
+        for part in reversed(line.rsplit(":", 1)[-1].split("/")):
+            if part.endswith(".service"):
+                return part
+    return None
+
+
+class ProcessSampler:
+    def __init__(self, interval: float = 2.0, keep: int = 50):
+        self.interval = interval
+        self.keep = keep
+        self.snapshot: List[Dict] = []
+        # CPU and memory percent per systemd unit, summed over all of its
+        # processes; None until the first sample
+        self.usage_by_unit: Optional[Dict[str, Dict[str, float]]] = None
+        # Host-wide CPU percent over the last interval; None until a second
+        # sample, since the first only sets psutil's baseline
+        self.cpu_pct: Optional[float] = None
+        self._cpu_primed = False
+        # Unit of each live pid, so cgroup files are read once per process
+        self._units: Dict[int, Optional[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if not PSUTIL_AVAILABLE or (self._task and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sample)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Process sampling failed", error=str(exc))
+            await asyncio.sleep(self.interval)
+
+    def sample(self) -> List[Dict]:
+        """Take one sample: the busiest processes, CPU first then memory, and per-unit usage."""
+        cpu_pct = psutil.cpu_percent(interval=None)
+        if self._cpu_primed:
+            self.cpu_pct = cpu_pct
+        self._cpu_primed = True
+        # attrs are fetched in one pass per process; vanished or denied
+        # processes report None instead of raising
+        procs = []
+        usage_by_unit: Dict[str, Dict[str, float]] = {}
+        units: Dict[int, Optional[str]] = {}
+        attrs = ["pid", "name", "cpu_percent", "memory_info", "memory_percent"]
+        for p in psutil.process_iter(attrs):
+            info = p.info
+            if info["memory_info"] is None:
+                continue
+            pid = info["pid"]
+            cpu = info["cpu_percent"] or 0.0
+            procs.append({
+                "pid": pid,
+                "name": info["name"],
+                "cpu": round(cpu, 1),
+                "memory": round(info["memory_info"].rss / (1024 * 1024), 1),  # MB
+            })
+            unit = self._units[pid] if pid in self._units else _unit_from_cgroup(pid)
+            units[pid] = unit
+            if unit is not None:
+                usage = usage_by_unit.setdefault(unit, {"cpu": 0.0, "mem": 0.0})
+                usage["cpu"] += cpu
+                usage["mem"] += info["memory_percent"] or 0.0
+        for usage in usage_by_unit.values():
+            usage["cpu"] = round(usage["cpu"], 1)
+            usage["mem"] = round(usage["mem"], 1)
+        # Only pids seen this time are kept, so exited processes drop out
+        self._units = units
+        self.usage_by_unit = usage_by_unit
+        procs.sort(key=lambda x: (x["cpu"], x["memory"]), reverse=True)
+        self.snapshot = procs[:self.keep]
+        return self.snapshot
+
+
+process_sampler = ProcessSampler()
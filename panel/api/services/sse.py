@@ -5,11 +5,11 @@ Provides real-time updates for telemetry, logs, and resource changes.
 """
 
 import asyncio
-import json
 from datetime import datetime, timezone
 from typing import Any, AsyncGenerator, Dict, Set
 from dataclasses import dataclass, field
 
+import orjson
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -124,7 +124,7 @@ class SSEManager:
         lines = [f"event: {event}"]
         
         if isinstance(data, (dict, list)):
-            lines.append(f"data: {json.dumps(data)}")
+            lines.append(f"data: {orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()}")
         else:
             lines.append(f"data: {data}")
         
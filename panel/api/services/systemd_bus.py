@@ -0,0 +1,83 @@
+"""Query systemd over the D-Bus system bus.
+
+Only used in native mode; container mode has no system bus and keeps going
+through host commands.
+"""
+
+import asyncio
+import os
+from typing import List, Optional, Tuple
+
+import structlog
+
+from services.host_exec import is_running_in_container
+
+try:
+    from dbus_next import BusType
+    from dbus_next.aio import MessageBus
+    DBUS_AVAILABLE = True
+except ImportError:
+    DBUS_AVAILABLE = False
+
+
+logger = structlog.get_logger(__name__)
+
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_OBJECT_PATH = "/org/freedesktop/systemd1"
+SYSTEMD_MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+
+# (unit name, active_state, sub_state) and (unit file name, unit_file_state)
+LoadedUnit = Tuple[str, str, str]
+InstalledUnit = Tuple[str, str]
+
+
+class SystemdBus:
+    """Lazily connected systemd Manager proxy shared across requests."""
+
+    def __init__(self):
+        self._bus = None
+        self._manager = None
+        self._lock = asyncio.Lock()
+
+    async def _get_manager(self):
+        async with self._lock:
+            if self._manager is None:
+                # Kept before introspection so a failure there is disconnected too
+                self._bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+                introspection = await self._bus.introspect(SYSTEMD_BUS_NAME, SYSTEMD_OBJECT_PATH)
+                proxy = self._bus.get_proxy_object(SYSTEMD_BUS_NAME, SYSTEMD_OBJECT_PATH, introspection)
+                self._manager = proxy.get_interface(SYSTEMD_MANAGER_INTERFACE)
+            return self._manager
+
+    async def _query(self) -> tuple:
+        manager = await self._get_manager()
+        return await asyncio.gather(
+            manager.call_list_units(),
+            manager.call_list_unit_files(),
+        )
+
+    def _reset(self) -> None:
+        """Drop the connection so the next query reconnects."""
+        if self._bus is not None:
+            self._bus.disconnect()
+        self._bus = None
+        self._manager = None
+
+    async def list_units(
+        self, timeout: float
+    ) -> Optional[Tuple[List[LoadedUnit], List[InstalledUnit]]]:
+        """Return loaded and installed units, or None if D-Bus is unusable or times out."""
+        if not DBUS_AVAILABLE or is_running_in_container():
+            return None
+        try:
+            units, unit_files = await asyncio.wait_for(self._query(), timeout)
+        except Exception as exc:
+            logger.debug("systemd D-Bus query failed, falling back to systemctl", error=str(exc))
+            self._reset()
+            return None
+        loaded = [(unit[0], unit[3], unit[4]) for unit in units]
+        installed = [(os.path.basename(path), state) for path, state in unit_files]
+        return loaded, installed
+
+
+systemd_bus = SystemdBus()
@@ -13,7 +13,7 @@ from typing import Dict, Optional
 import structlog
 
 from config import settings
-from db import get_telemetry_db
+from db import delete_in_batches, get_telemetry_db
 from services.agent_client import agent_client
 from services.sse import sse_manager, Channels
 
@@ -217,13 +217,7 @@ class TelemetryCollector:
         summary_cutoff = now - (settings.telemetry_summary_retention_days * 24 * 3600)
 
         # Delete old summaries
-        cursor = await db.execute(
-            "DELETE FROM metrics_summary WHERE ts < ?",
-            (summary_cutoff,)
-        )
-        summary_deleted = cursor.rowcount
-
-        await db.commit()
+        summary_deleted = await delete_in_batches(db, "metrics_summary", "ts < ?", (summary_cutoff,))
 
         raw_deleted = retention_result["telemetry"]["deleted_rows"]
         iot_deleted = retention_result["iot"]["deleted_rows"]
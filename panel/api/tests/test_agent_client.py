@@ -218,7 +218,9 @@ class TestAgentClientMethods:
         client = AgentClient(socket_path="/tmp/test.sock")
         client.resource_action = AsyncMock(return_value={"success": True})
 
-        result = await client.execute_action("demo.service", "restart", {"force": True}, timeout=45.0)
+        result = await client.execute_action(
+            "demo.service", "restart", {"force": True}, timeout=45.0, action_timeout=30
+        )
 
         assert result == {"success": True}
         client.resource_action.assert_awaited_once_with(
@@ -226,6 +228,21 @@ class TestAgentClientMethods:
             action="restart",
             params={"force": True},
             timeout=45.0,
+            action_timeout=30,
+        )
+
+    @pytest.mark.asyncio
+    async def test_resource_action_sends_action_timeout_to_agent(self):
+        """The per-action ceiling travels in the RPC params, not the transport timeout."""
+        client = AgentClient(socket_path="/tmp/test.sock")
+        client.call = AsyncMock(return_value={"success": True})
+
+        await client.resource_action("demo.service", "start", action_timeout=15)
+
+        client.call.assert_awaited_once_with(
+            "resource.action",
+            {"resource_id": "demo.service", "action": "start", "params": {}, "timeout": 15},
+            timeout=90.0,
         )
 
 
@@ -5,7 +5,7 @@ Unit tests for device models and endpoint logic.
 """
 
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import os
 os.environ["JWT_SECRET"] = "test-secret-key-for-testing"
@@ -119,7 +119,7 @@ class TestLocalDeviceDiscovery:
     async def test_empty_output(self):
         """Test discovery returns empty list when host command returns nothing."""
         from routers.devices import _local_device_discovery
-        with patch("services.host_exec.run_host_command_simple", return_value=""):
+        with patch("services.host_exec.run_host_command_async", new_callable=AsyncMock, return_value=""):
             result = await _local_device_discovery()
             assert result == []
 
@@ -135,7 +135,7 @@ class TestLocalDeviceDiscovery:
             "===SER===\n"
             "===END===\n"
         )
-        with patch("services.host_exec.run_host_command_simple", return_value=fake_output):
+        with patch("services.host_exec.run_host_command_async", new_callable=AsyncMock, return_value=fake_output):
             result = await _local_device_discovery()
             # Should have 1 device (root hub is skipped)
             assert len(result) == 1
@@ -153,7 +153,7 @@ class TestLocalDeviceDiscovery:
             "/dev/ttyACM0\n"
             "===END===\n"
         )
-        with patch("services.host_exec.run_host_command_simple", return_value=fake_output):
+        with patch("services.host_exec.run_host_command_async", new_callable=AsyncMock, return_value=fake_output):
             result = await _local_device_discovery()
             serial_devs = [d for d in result if d.type == "serial"]
             assert len(serial_devs) == 2
@@ -162,7 +162,7 @@ class TestLocalDeviceDiscovery:
     async def test_exception_handling(self):
         """Test discovery handles exceptions gracefully."""
         from routers.devices import _local_device_discovery
-        with patch("services.host_exec.run_host_command_simple", side_effect=Exception("SSH failed")):
+        with patch("services.host_exec.run_host_command_async", new_callable=AsyncMock, side_effect=Exception("SSH failed")):
             result = await _local_device_discovery()
             assert result == []
 
@@ -218,7 +218,7 @@ class TestGPIOLocalStatus:
     async def test_raspi_gpio_not_found(self):
         """Test GPIO returns empty when raspi-gpio not found."""
         from routers.devices import _get_local_gpio_status
-        with patch("services.host_exec.run_host_command_simple", return_value="command not found"):
+        with patch("services.host_exec.run_host_command_async", new_callable=AsyncMock, return_value="command not found"):
             result = await _get_local_gpio_status()
             assert "pins" in result
 
@@ -231,7 +231,7 @@ class TestGPIOLocalStatus:
             "GPIO 3: level=0 fsel=0 func=INPUT pull=DOWN\n"
             "GPIO 40: level=0 fsel=0 func=INPUT pull=NONE\n"
         )
-        with patch("services.host_exec.run_host_command_simple", return_value=fake_output):
+        with patch("services.host_exec.run_host_command_async", new_callable=AsyncMock, return_value=fake_output):
             result = await _get_local_gpio_status()
             pins = result["pins"]
             # GPIO 40 > 27 should be filtered out
@@ -0,0 +1,59 @@
+import asyncio
+from unittest.mock import patch
+
+from services import host_exec
+
+
+def test_async_host_command_returns_stdout_natively():
+    with patch("services.host_exec.is_running_in_container", return_value=False):
+        output = asyncio.run(host_exec.run_host_command_async("printf 'a\\nb\\n'"))
+
+    assert output == "a\nb\n"
+
+
+def test_async_host_command_hides_output_of_failed_commands():
+    with patch("services.host_exec.is_running_in_container", return_value=False):
+        output = asyncio.run(host_exec.run_host_command_async("echo partial; exit 3"))
+
+    assert output == ""
+
+
+def test_async_host_command_times_out_without_blocking():
+    with patch("services.host_exec.is_running_in_container", return_value=False):
+        output = asyncio.run(host_exec.run_host_command_async("sleep 5", timeout=0.1))
+
+    assert output == ""
+
+
+def test_cancelled_host_command_kills_its_process_group():
+    async def cancel_midway():
+        task = asyncio.create_task(host_exec.run_host_command_async("sleep 5"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    with patch("services.host_exec.is_running_in_container", return_value=False), \
+            patch("services.host_exec._kill_process_group", wraps=host_exec._kill_process_group) as kill:
+        cancelled = asyncio.run(cancel_midway())
+
+    assert cancelled
+    kill.assert_called_once()
+
+
+def test_container_commands_share_a_multiplexed_ssh_connection():
+    completed = host_exec.subprocess.CompletedProcess([], 0, stdout="ok\n", stderr="")
+    with patch("services.host_exec.get_host_gateway", return_value="10.0.0.1"), \
+            patch.dict("os.environ", {"SSH_HOST_USER": "pi"}), \
+            patch("services.host_exec.subprocess.run", return_value=completed) as run:
+        host_exec.run_container_host_command("uptime")
+        host_exec.run_container_host_command("uptime")
+
+    for call in run.call_args_list:
+        argv = call.args[0]
+        assert "ControlMaster=auto" in argv
+        assert "ControlPersist=10m" in argv
+        assert argv[-2:] == ["pi@10.0.0.1", "uptime"]
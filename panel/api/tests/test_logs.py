@@ -0,0 +1,195 @@
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("JWT_SECRET", "test-secret-key-for-testing")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+os.environ.setdefault("TELEMETRY_DB_PATH", ":memory:")
+os.environ.setdefault("API_DEBUG", "true")
+
+
+@pytest.fixture
+def client():
+    from main import app
+    from routers.auth import get_current_user
+
+    async def viewer_user():
+        return {"id": 1, "username": "viewer", "role": "viewer", "has_totp": False}
+
+    app.dependency_overrides[get_current_user] = viewer_user
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def test_parse_iso_and_syslog_lines():
+    from routers.logs import _parse_log_line
+
+    iso = _parse_log_line("2024-01-15T10:30:00Z [warn] Disk nearly full")
+    assert (iso.timestamp, iso.level, iso.message) == (
+        "2024-01-15T10:30:00Z",
+        "WARN",
+        "Disk nearly full",
+    )
+
+    syslog = _parse_log_line("Jan 15 10:30:00 raspberrypi sshd[42]: Accepted key")
+    assert syslog.timestamp == "Jan 15 10:30:00"
+    assert syslog.source == "sshd[42]"
+    assert syslog.message == "Accepted key"
+
+
+def test_get_logs_filters_by_level(client):
+    raw_logs = [
+        "2024-01-15T10:30:00Z [INFO] Container started",
+        "2024-01-15T10:30:05Z [ERROR] Health check failed",
+    ]
+    with patch(
+        "routers.logs.agent_client.get_resource_logs",
+        new=AsyncMock(return_value=raw_logs),
+    ):
+        response = client.get("/api/logs/app.service", params={"level": "error"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert body["lines"][0]["message"] == "Health check failed"
+
+
+def test_tail_logs_returns_plain_dicts(client):
+    with patch(
+        "routers.logs.agent_client.get_resource_logs",
+        new=AsyncMock(return_value=["2024-01-15T10:30:00Z [INFO] ready"]),
+    ):
+        response = client.get("/api/logs/app.service/tail", params={"lines": 5})
+
+    assert response.status_code == 200
+    assert response.json()["lines"] == [
+        {
+            "timestamp": "2024-01-15T10:30:00Z",
+            "level": "INFO",
+            "message": "ready",
+            "source": None,
+        }
+    ]
+
+
+def test_search_logs_matches_any_term_case_insensitively(client):
+    raw_logs = [
+        "2024-01-15T10:30:00Z [INFO] boot",
+        "2024-01-15T10:30:01Z [ERROR] Out Of Memory",
+        "2024-01-15T10:30:02Z [INFO] idle",
+        "2024-01-15T10:30:03Z [ERROR] segfault in worker",
+    ]
+    with patch(
+        "routers.logs.agent_client.get_resource_logs",
+        new=AsyncMock(return_value=raw_logs),
+    ):
+        response = client.get(
+            "/api/logs/app.service/search",
+            params={"query": "out of memory|SEGFAULT", "any_term": True, "context_lines": 1},
+        )
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["line_number"] for result in results] == [1, 3]
+    assert results[0]["context"] == raw_logs[0:3]
+    assert results[1]["timestamp"] == "2024-01-15T10:30:03Z"
+
+
+def test_search_logs_rejects_too_many_terms_before_fetching(client):
+    fetch = AsyncMock(return_value=[])
+    with patch("routers.logs.agent_client.get_resource_logs", new=fetch):
+        response = client.get(
+            "/api/logs/app.service/search",
+            params={"query": "|".join(f"t{i}" for i in range(11)), "any_term": True},
+        )
+
+    assert response.status_code == 400
+    fetch.assert_not_awaited()
+
+
+def test_search_logs_matches_pipes_literally_by_default(client):
+    raw_logs = [
+        "2024-01-15T10:30:00Z [INFO] cat a | grep b",
+        "2024-01-15T10:30:01Z [INFO] cat a",
+    ]
+    with patch(
+        "routers.logs.agent_client.get_resource_logs",
+        new=AsyncMock(return_value=raw_logs),
+    ):
+        response = client.get(
+            "/api/logs/app.service/search",
+            params={"query": "a | grep", "context_lines": 0},
+        )
+
+    assert response.status_code == 200
+    assert [result["line_number"] for result in response.json()] == [0]
+
+
+def test_get_logs_widens_fetch_until_tail_matches_are_found(client):
+    journal = [
+        f"2024-01-15T10:{minute:02d}:00Z [{'ERROR' if minute % 20 == 0 else 'INFO'}] event {minute}"
+        for minute in range(60)
+    ]
+
+    async def fake_logs(resource_id, tail):
+        return journal[-tail:]
+
+    fetch = AsyncMock(side_effect=fake_logs)
+    with patch("routers.logs.agent_client.get_resource_logs", new=fetch):
+        response = client.get(
+            "/api/logs/app.service", params={"tail": 2, "level": "error"}
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [line["message"] for line in body["lines"]] == ["event 20", "event 40"]
+    assert [call.args[1] for call in fetch.await_args_list] == [2, 8, 32, 128]
+
+
+def test_get_logs_time_filters_compare_parsed_datetimes(client):
+    raw_logs = [
+        "2024-01-15T10:29:59+02:00 [INFO] before window",
+        "2024-01-15T08:30:00Z [INFO] at start",
+        "2024-01-15T10:45:00+02:00 [INFO] inside window",
+        "2024-01-15T09:00:01Z [INFO] after window",
+    ]
+    with patch(
+        "routers.logs.agent_client.get_resource_logs",
+        new=AsyncMock(return_value=raw_logs),
+    ):
+        response = client.get(
+            "/api/logs/app.service",
+            params={"since": "2024-01-15T08:30:00+00:00", "until": "2024-01-15T09:00:00Z"},
+        )
+
+    assert response.status_code == 200
+    assert [line["message"] for line in response.json()["lines"]] == [
+        "at start",
+        "inside window",
+    ]
+
+
+def test_get_logs_rejects_invalid_since(client):
+    response = client.get("/api/logs/app.service", params={"since": "yesterday"})
+
+    assert response.status_code == 400
+
+
+def test_syslog_timestamps_are_local_time_converted_to_utc(monkeypatch):
+    import time
+    from datetime import datetime
+
+    from routers.logs import _log_timestamp
+
+    monkeypatch.setenv("TZ", "Etc/GMT-2")  # UTC+2
+    time.tzset()
+    try:
+        parsed = _log_timestamp("Jan 15 10:30:00")
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert parsed == datetime(datetime.now().year, 1, 15, 8, 30)
@@ -20,7 +20,7 @@ async def test_fresh_migrations_are_secure_complete_and_idempotent(
     try:
         assert stat.S_IMODE(database_path.stat().st_mode) == 0o600
         assert database.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
-        assert database.execute("SELECT COUNT(*) FROM migrations").fetchone()[0] == 7
+        assert database.execute("SELECT COUNT(*) FROM migrations").fetchone()[0] == 10
         assert database.execute(
             "SELECT username, role FROM users ORDER BY username"
         ).fetchall() == [("admin", "admin")]
@@ -44,6 +44,29 @@ async def test_fresh_migrations_are_secure_complete_and_idempotent(
             "users",
         } <= tables
 
+        indexes = {
+            row[0]
+            for row in database.execute(
+                "SELECT name FROM sqlite_master WHERE type='index'"
+            ).fetchall()
+        }
+        assert {
+            "idx_resources_unmanaged_discovered",
+            "idx_resources_name",
+        } <= indexes
+        assert "idx_resources_provider_class_managed_name" not in indexes
+        plan = database.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM resources "
+            "WHERE (:provider IS NULL OR provider = :provider) ORDER BY name",
+            {"provider": None},
+        ).fetchall()
+        assert not any("TEMP B-TREE" in row[-1] for row in plan)
+        plan = database.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM resources "
+            "WHERE managed = 0 ORDER BY discovered_at DESC"
+        ).fetchall()
+        assert any("idx_resources_unmanaged_discovered" in row[-1] for row in plan)
+
         job_columns = {
             row[1] for row in database.execute("PRAGMA table_info(jobs)").fetchall()
         }
@@ -60,3 +83,59 @@ async def test_initial_admin_migration_requires_explicit_password(
 
     with pytest.raises(RuntimeError, match="DEFAULT_ADMIN_PASSWORD is required"):
         await run_migrations(str(tmp_path / "control.db"))
+
+
+@pytest.mark.asyncio
+async def test_connections_use_wal_and_tuned_pragmas(tmp_path, monkeypatch):
+    import db
+    from config import settings
+
+    monkeypatch.setattr(settings, "database_path", settings.database_path)
+    monkeypatch.setattr(settings, "telemetry_db_path", settings.telemetry_db_path)
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "control.db"))
+    monkeypatch.setenv("TELEMETRY_DB_PATH", str(tmp_path / "telemetry.db"))
+
+    await db.init_db()
+    try:
+        pragmas = {}
+        for connection in (await db.get_control_db(), await db.get_telemetry_db()):
+            values = {}
+            for name in ("journal_mode", "synchronous", "temp_store", "cache_size"):
+                cursor = await connection.execute(f"PRAGMA {name}")
+                values[name] = (await cursor.fetchone())[0]
+            pragmas[connection] = values
+    finally:
+        await db.close_db()
+
+    # synchronous NORMAL == 1, temp_store MEMORY == 2
+    assert list(pragmas.values()) == [{
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "temp_store": 2,
+        "cache_size": -65536,
+    }] * 2
+
+
+@pytest.mark.asyncio
+async def test_metric_range_queries_use_covering_index(tmp_path, monkeypatch):
+    import db
+    from config import settings
+
+    monkeypatch.setattr(settings, "database_path", settings.database_path)
+    monkeypatch.setattr(settings, "telemetry_db_path", settings.telemetry_db_path)
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "control.db"))
+    monkeypatch.setenv("TELEMETRY_DB_PATH", str(tmp_path / "telemetry.db"))
+
+    await db.init_db()
+    try:
+        telemetry = await db.get_telemetry_db()
+        cursor = await telemetry.execute(
+            "EXPLAIN QUERY PLAN SELECT AVG(value), MIN(value), MAX(value), COUNT(*) "
+            "FROM metrics_raw WHERE metric = ? AND ts >= ?",
+            ("host.cpu.pct_total", 0),
+        )
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+    finally:
+        await db.close_db()
+
+    assert "COVERING INDEX idx_metrics_raw_metric_ts" in plan
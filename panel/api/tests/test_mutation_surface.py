@@ -158,6 +158,13 @@ def mutation_client():
                 new=Mock(return_value=""),
             )
         )
+        stack.enter_context(
+            patch.object(
+                host_exec,
+                "run_host_command_async",
+                new=AsyncMock(return_value=""),
+            )
+        )
         stack.enter_context(
             patch.object(notification_module, "TOKEN_FILE", TEST_ROOT / "telegram-token")
         )
@@ -69,3 +69,100 @@ def test_agent_failure_propagates_to_interface_action(admin_client):
 
     assert response.status_code == 502
     assert response.json()["detail"] == "device missing"
+
+
+@pytest.mark.asyncio
+async def test_local_interfaces_are_built_from_ip_json():
+    from routers.network import _get_local_interfaces
+
+    links = [
+        {"ifname": "lo", "flags": ["LOOPBACK", "UP"], "addr_info": []},
+        {
+            "ifname": "wlan0",
+            "flags": ["BROADCAST", "MULTICAST"],
+            "address": "dc:a6:32:00:00:02",
+            "addr_info": [],
+            "stats64": {"rx": {"bytes": 10}, "tx": {"bytes": 20}},
+        },
+        {
+            "ifname": "eth0",
+            "flags": ["BROADCAST", "MULTICAST", "UP", "LOWER_UP"],
+            "address": "dc:a6:32:00:00:01",
+            "addr_info": [
+                {"family": "inet6", "local": "fe80::1", "prefixlen": 64},
+                {"family": "inet", "local": "192.168.1.20", "prefixlen": 24},
+            ],
+            "stats64": {"rx": {"bytes": 1234}, "tx": {"bytes": 5678}},
+        },
+    ]
+
+    with patch(
+        "routers.network._run_ip_json",
+        new=AsyncMock(return_value=links),
+    ), patch(
+        "routers.network._read_default_gateways",
+        return_value={"eth0": "192.168.1.1"},
+    ), patch("routers.network._read_link_speed", return_value=1000):
+        interfaces = await _get_local_interfaces()
+
+    assert [iface.name for iface in interfaces] == ["eth0", "wlan0"]
+    eth0, wlan0 = interfaces
+    assert eth0.status == "up"
+    assert eth0.ip == "192.168.1.20"
+    assert eth0.subnet_mask == "255.255.255.0"
+    assert eth0.gateway == "192.168.1.1"
+    assert (eth0.rx_bytes, eth0.tx_bytes, eth0.speed_mbps) == (1234, 5678, 1000)
+    assert wlan0.type == "wifi"
+    assert wlan0.status == "down"
+    assert (wlan0.rx_bytes, wlan0.tx_bytes, wlan0.speed_mbps) == (0, 0, None)
+
+
+def test_network_overview_gathers_sections_and_tolerates_failures(admin_client):
+    responses = {
+        "network.wifi.status": {"connected": True, "ssid": "home"},
+        "network.bluetooth.status": RuntimeError("bluetoothd down"),
+        "network.connectivity.check": {"internet": True},
+        "network.dns.get": {"servers": ["1.1.1.1"]},
+    }
+
+    async def fake_call(method, params=None):
+        result = responses[method]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with patch("routers.network.agent_client.call", new=AsyncMock(side_effect=fake_call)):
+        response = admin_client.get("/api/network/overview")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "wifi": {"connected": True, "ssid": "home"},
+        "bluetooth": None,
+        "connectivity": {"internet": True},
+        "dns": {"servers": ["1.1.1.1"]},
+    }
+
+
+def test_default_gateways_are_read_from_proc_net_route(tmp_path):
+    from routers import network
+
+    route_table = (
+        "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\n"
+        "eth0\t00000000\t0101A8C0\t0003\t0\t0\t100\t00000000\n"
+        "eth0\t0001A8C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\n"
+        "wlan0\t00000000\t0100000A\t0003\t0\t0\t600\t00000000\n"
+        "eth0\t00000000\t0201A8C0\t0003\t0\t0\t200\t00000000\n"
+    )
+    route_file = tmp_path / "route"
+    route_file.write_text(route_table)
+    real_open = open
+
+    def fake_open(path, *args, **kwargs):
+        if path == "/proc/net/route":
+            path = route_file
+        return real_open(path, *args, **kwargs)
+
+    with patch("builtins.open", side_effect=fake_open):
+        gateways = network._read_default_gateways()
+
+    assert gateways == {"eth0": "192.168.1.1", "wlan0": "10.0.0.1"}
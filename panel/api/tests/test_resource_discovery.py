@@ -1,8 +1,23 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
 from routers.resources import _classify_service, _state_from_systemd
 from routers.auth import hash_refresh_token
 from routers.telemetry import _with_metric_aliases
 
 
+@pytest.fixture(autouse=True)
+def _host_command_discovery():
+    """Keep discovery on the patched host commands, never the real bus or /proc."""
+    with patch("services.systemd_bus.DBUS_AVAILABLE", False), \
+            patch("routers.resources.PSUTIL_AVAILABLE", False):
+        yield
+
+
 def test_adguard_is_manageable_application():
     assert _classify_service("AdGuardHome") == "APP"
 
@@ -35,3 +50,366 @@ def test_canonical_disk_metrics_are_available_to_legacy_dashboard():
     assert telemetry["metrics"]["disk._root.used_pct"] == 42
     assert telemetry["metrics"]["disk._root.pct"] == 42
     assert telemetry["metrics"]["disk._root.total_gb"] == 58
+
+
+def _fake_host(outputs, calls):
+    async def run_async(command, timeout=30):
+        calls.append(command)
+        for prefix, output in outputs.items():
+            if command.startswith(prefix):
+                return output
+        return ""
+
+    return run_async
+
+
+def test_live_services_use_batched_systemctl_listing():
+    import routers.resources as resources
+
+    outputs = {
+        "ps -axo": "nginx.service 1.5 2.0\n",
+        "systemctl show": (
+            "Id=nginx.service\nActiveState=active\nSubState=running\n\n"
+            "Id=ssh.service\nActiveState=active\nSubState=running\n"
+        ),
+        "systemctl list-unit-files": (
+            "nginx.service enabled enabled\n"
+            "bluetooth.service disabled enabled\n"
+            "getty@.service enabled enabled\n"
+        ),
+    }
+    calls = []
+    resources._services_cache = ([], 0)
+    run_async = _fake_host(outputs, calls)
+    with patch("routers.resources.run_host_command_async", side_effect=run_async):
+        services = asyncio.run(resources._get_live_systemd_services(force_refresh=True))
+
+    assert len(calls) == 3
+    by_name = {service.name: service for service in services}
+    assert set(by_name) == {"nginx", "ssh", "bluetooth"}
+    assert by_name["nginx"].state == "running"
+    assert by_name["nginx"].unit_file_state == "enabled"
+    assert (by_name["nginx"].cpu_usage, by_name["nginx"].memory_usage) == (1.5, 2.0)
+    assert by_name["ssh"].resource_class == "CORE"
+    assert by_name["bluetooth"].state == "stopped"
+    assert by_name["bluetooth"].resource_class == "SYSTEM"
+
+
+def test_concurrent_service_listing_shares_one_refresh():
+    import routers.resources as resources
+
+    calls = []
+    run_async = _fake_host(
+        {"systemctl show": "Id=nginx.service\nActiveState=active\nSubState=running\n"},
+        calls,
+    )
+
+    async def slow_run_async(command, timeout=30):
+        await asyncio.sleep(0.01)
+        return await run_async(command, timeout)
+
+    async def list_twice():
+        return await asyncio.gather(
+            resources._get_live_systemd_services(),
+            resources._get_live_systemd_services(),
+        )
+
+    resources._services_cache = ([], 0)
+    with patch("routers.resources.run_host_command_async", side_effect=slow_run_async):
+        first, second = asyncio.run(list_twice())
+
+    assert first is second
+    assert len(calls) == 3
+
+
+def test_resource_rows_map_to_response_fields():
+    from routers.resources import _row_to_resource
+
+    resource = _row_to_resource(
+        ("docker-web", "web", "container", "APP", "docker", "running", 90, 1, "2024-01-15 10:30:00")
+    )
+
+    assert resource.resource_class == "APP"
+    assert resource.managed is True
+    assert resource.health_score == 90
+    assert resource.allowed_actions == []
+    assert resource.model_dump()["updated_at"] == "2024-01-15 10:30:00"
+
+
+class _RecordingDb:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+        self.statements = []
+        self.params = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, sql, params=()):
+        self.statements.append(sql.split()[0])
+        self.params.append(params)
+        return type("Cursor", (), {"rowcount": self.rowcount})()
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def test_manage_and_ignore_commit_state_change_and_audit_once():
+    import routers.resources as resources
+
+    user = {"id": 1, "role": "admin"}
+    for call, first in (
+        (lambda: resources.manage_resource("docker-web", "APP", user), "UPDATE"),
+        (lambda: resources.ignore_resource("docker-web", user), "DELETE"),
+    ):
+        database = _RecordingDb(rowcount=1)
+        with patch.object(resources, "get_control_db", return_value=database):
+            asyncio.run(call())
+        assert database.statements == [first, "INSERT"]
+        assert (database.commits, database.rollbacks) == (1, 0)
+
+
+def test_manage_missing_resource_raises_without_touching_shared_transaction():
+    import routers.resources as resources
+
+    database = _RecordingDb(rowcount=0)
+    with patch.object(resources, "get_control_db", return_value=database):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(resources.manage_resource("missing", "APP", {"id": 1}))
+
+    assert exc_info.value.status_code == 404
+    assert database.statements == ["UPDATE"]
+    assert (database.commits, database.rollbacks) == (0, 0)
+
+
+def test_manage_audit_details_are_json():
+    import json
+
+    import routers.resources as resources
+
+    database = _RecordingDb(rowcount=1)
+    with patch.object(resources, "get_control_db", return_value=database):
+        asyncio.run(resources.manage_resource("docker-web", "APP", {"id": 1}))
+
+    assert json.loads(database.params[-1][3]) == {"class": "APP"}
+
+
+def test_service_classification_table():
+    assert _classify_service("systemd-journald") == "CORE"
+    assert _classify_service("systemd-udevd") == "SYSTEM"
+    assert _classify_service("systemd-random-seed") == "SYSTEM"
+    assert _classify_service("cron") == "SYSTEM"
+    assert _classify_service("nginx") == "APP"
+
+
+def test_list_resources_skips_host_for_other_providers_and_db_for_systemd():
+    from unittest.mock import AsyncMock
+
+    import routers.resources as resources
+
+    row = ("docker-web", "web", "container", "APP", "docker", "running", 100, 1, "now")
+
+    class _Rows:
+        async def fetchall(self):
+            return [row]
+
+    database = _RecordingDb(rowcount=0)
+    database.execute = AsyncMock(return_value=_Rows())
+    live = AsyncMock(return_value=[])
+    with patch.object(resources, "get_control_db", return_value=database), \
+            patch.object(resources, "_get_live_systemd_services", live):
+        docker = asyncio.run(resources.list_resources("docker", None, None, False, {}))
+        asyncio.run(resources.list_resources("systemd", None, None, False, {}))
+
+    assert [item["id"] for item in json.loads(docker.body)] == ["docker-web"]
+    assert live.await_count == 1
+    assert database.execute.await_count == 1
+
+
+def test_audit_writer_batches_inserts_and_flushes_on_stop():
+    import services.audit_writer as audit_writer_module
+
+    class _BatchDb:
+        def __init__(self):
+            self.batches = []
+            self.commits = 0
+
+        async def executemany(self, sql, rows):
+            self.batches.append(list(rows))
+
+        async def commit(self):
+            self.commits += 1
+
+    database = _BatchDb()
+
+    async def run():
+        writer = audit_writer_module.AuditWriter(batch_size=2, flush_interval=10)
+        await writer.start()
+        for index in range(3):
+            writer.enqueue(1, "resource.restart", f"systemd-{index}")
+        await asyncio.sleep(0)
+        await writer.stop()
+
+    with patch.object(audit_writer_module, "get_control_db", return_value=database):
+        asyncio.run(run())
+
+    assert [len(batch) for batch in database.batches] == [2, 1]
+    assert database.commits == 2
+
+
+def test_unfiltered_systemd_listing_reuses_serialized_bytes():
+    from unittest.mock import AsyncMock
+
+    import routers.resources as resources
+
+    services = [resources._row_to_resource(
+        ("systemd-nginx", "nginx", "service", "APP", "systemd", "running", 100, 1, "now")
+    )]
+    live = AsyncMock(return_value=services)
+    with patch.object(resources, "_get_live_systemd_services", live):
+        first = asyncio.run(resources.list_resources("systemd", None, None, False, {}))
+        second = asyncio.run(resources.list_resources("systemd", None, None, False, {}))
+
+    assert first.body is second.body
+    assert [item["id"] for item in json.loads(first.body)] == ["systemd-nginx"]
+
+
+def test_parse_units_merges_loaded_and_installed_services():
+    from routers.resources import _parse_units
+
+    units = _parse_units(
+        "Id=nginx.service\nActiveState=active\nSubState=running\n\n"
+        "Id=dev-sda.device\nActiveState=active\nSubState=plugged\n",
+        "nginx.service enabled enabled\n"
+        "bluetooth.service disabled enabled\n"
+        "getty@.service enabled enabled\n",
+    )
+
+    assert units == {
+        "nginx": ("active", "running", "enabled"),
+        "bluetooth": ("inactive", "dead", "disabled"),
+    }
+
+
+def test_live_services_prefer_systemd_dbus_when_available():
+    from unittest.mock import AsyncMock
+
+    import routers.resources as resources
+
+    calls = []
+    run_async = _fake_host({}, calls)
+    bus_units = (
+        [("nginx.service", "active", "running"), ("dev-sda.device", "active", "plugged")],
+        [("nginx.service", "enabled"), ("bluetooth.service", "disabled")],
+    )
+    resources._services_cache = ([], 0)
+    with patch("routers.resources.run_host_command_async", side_effect=run_async), patch.object(resources.systemd_bus, "list_units", AsyncMock(return_value=bus_units)):
+        services = asyncio.run(resources._get_live_systemd_services(force_refresh=True))
+
+    assert [command.split()[0] for command in calls] == ["ps"]
+    by_name = {service.name: service for service in services}
+    assert set(by_name) == {"nginx", "bluetooth"}
+    assert by_name["nginx"].unit_file_state == "enabled"
+    assert by_name["bluetooth"].state == "stopped"
+
+
+def test_hung_systemd_bus_times_out_and_disconnects():
+    from unittest.mock import Mock
+
+    import services.systemd_bus as bus_module
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    bus = bus_module.SystemdBus()
+    connection = Mock()
+    bus._bus = connection
+    bus._manager = type("Manager", (), {
+        "call_list_units": staticmethod(hang), "call_list_unit_files": staticmethod(hang),
+    })()
+    with patch.object(bus_module, "DBUS_AVAILABLE", True), \
+            patch.object(bus_module, "is_running_in_container", return_value=False):
+        assert asyncio.run(bus.list_units(timeout=0.01)) is None
+
+    connection.disconnect.assert_called_once()
+    assert (bus._bus, bus._manager) == (None, None)
+
+def test_invalidation_discards_refresh_started_before_it():
+    import routers.resources as resources
+
+    calls = []
+    run_async = _fake_host(
+        {"systemctl show": "Id=nginx.service\nActiveState=active\nSubState=running\n"},
+        calls,
+    )
+
+    async def invalidating_run_async(command, timeout=30):
+        # A service action lands while this refresh is still reading the host
+        resources._invalidate_services_cache()
+        return await run_async(command, timeout)
+
+    resources._invalidate_services_cache()
+    with patch("routers.resources.run_host_command_async", side_effect=invalidating_run_async):
+        services = asyncio.run(resources._get_live_systemd_services(force_refresh=True))
+
+    assert [service.name for service in services] == ["nginx"]
+    assert resources._cached_services() is None
+
+
+def test_usage_map_comes_from_the_process_sampler_tick():
+    import services.process_sampler as sampler_module
+
+    import routers.resources as resources
+
+    processes = [
+        type("Proc", (), {"info": {
+            "pid": pid, "name": "proc", "cpu_percent": cpu,
+            "memory_info": type("Mem", (), {"rss": 1024 * 1024})(), "memory_percent": mem,
+        }})()
+        for pid, cpu, mem in ((1, 1.25, 2.0), (2, 0.5, 1.0), (3, 9.0, 9.0))
+    ]
+    units = {1: "nginx.service", 2: "nginx.service", 3: None}
+    fake_psutil = type("FakePsutil", (), {
+        "process_iter": staticmethod(lambda attrs: processes),
+        "cpu_percent": staticmethod(lambda interval: 0.0),
+    })
+    sampler = sampler_module.ProcessSampler()
+    with patch.object(sampler_module, "psutil", fake_psutil, create=True), \
+            patch.object(sampler_module, "_unit_from_cgroup", side_effect=units.get) as lookup:
+        sampler.sample()
+        sampler.sample()
+        with patch.object(resources, "PSUTIL_AVAILABLE", True), \
+                patch.object(resources, "is_running_in_container", return_value=False), \
+                patch.object(resources, "process_sampler", sampler):
+            usage = asyncio.run(resources._read_usage_map())
+
+    assert usage == {"nginx.service": {"cpu": 1.8, "mem": 3.0}}
+    # cgroup membership is read once per pid, not on every tick
+    assert lookup.call_count == 3
+
+
+def test_timed_out_service_action_returns_504():
+    from unittest.mock import AsyncMock, Mock
+
+    import routers.resources as resources
+
+    class _NoRow:
+        async def fetchone(self):
+            return None
+
+    database = _RecordingDb(rowcount=0)
+    database.execute = AsyncMock(return_value=_NoRow())
+    timed_out = {"success": False, "error": "TIMEOUT", "message": "timed out after 15s"}
+    action = AsyncMock(return_value=timed_out)
+    with patch.object(resources, "get_control_db", return_value=database), \
+            patch.object(resources.agent_client, "execute_action", action), \
+            patch.object(resources.audit_writer, "enqueue", Mock()):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(resources.execute_action(
+                "systemd-nginx", resources.ActionRequest(action="start"), {"id": 1}
+            ))
+
+    assert exc_info.value.status_code == 504
+    assert action.await_args.kwargs == {"action_timeout": resources.ACTION_TIMEOUTS["start"]}
@@ -71,27 +71,27 @@ async def reset_global_sse_manager():
         (
             lambda request: sse_router.telemetry_stream(request, {"id": 1}),
             Channels.TELEMETRY,
-            '"client_id"',
+            b'"client_id"',
         ),
         (
             lambda request: sse_router.resources_stream(request, {"id": 1}),
             Channels.RESOURCES,
-            '"client_id"',
+            b'"client_id"',
         ),
         (
             lambda request: sse_router.logs_stream("svc.service", request, {"id": 1}),
             Channels.logs("svc.service"),
-            '"resource_id": "svc.service"',
+            b'"resource_id":"svc.service"',
         ),
         (
             lambda request: sse_router.job_stream("job-1", request, {"id": 1}),
             Channels.job("job-1"),
-            '"job_id": "job-1"',
+            b'"job_id":"job-1"',
         ),
         (
             lambda request: sse_router.alerts_stream(request, {"id": 1}),
             Channels.ALERTS,
-            '"client_id"',
+            b'"client_id"',
         ),
     ],
 )
@@ -123,7 +123,7 @@ async def test_main_stream_defaults_and_forwards_events():
         Channels.TELEMETRY, "telemetry", {"cpu": 12}
     )
     assert await anext(response.body_iterator) == (
-        'event: telemetry\ndata: {"cpu": 12}\n\n'
+        'event: telemetry\ndata: {"cpu":12}\n\n'
     )
 
     await response.body_iterator.aclose()
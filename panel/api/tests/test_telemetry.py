@@ -155,6 +155,143 @@ class TestLocalMetricsFallback:
         metrics = result.get("metrics", {})
         assert "host.cpu.pct_total" in metrics
 
+    @pytest.mark.asyncio
+    async def test_cpu_comes_from_the_process_sampler_tick(self):
+        """psutil's CPU baseline is left to the sampler; its last reading is reused."""
+        from unittest.mock import patch
+
+        import routers.telemetry as telemetry
+
+        with patch.object(telemetry, "PSUTIL_AVAILABLE", True), \
+                patch.object(telemetry.process_sampler, "cpu_pct", 37.5), \
+                patch.object(telemetry, "psutil", create=True) as fake_psutil:
+            pct = await telemetry._sample_cpu("")
+
+        assert pct == 37.5
+        fake_psutil.cpu_percent.assert_not_called()
+
+
+class TestCurrentSnapshot:
+    """Test the shared /current snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self):
+        import asyncio
+        from unittest.mock import patch
+
+        import routers.telemetry as telemetry
+
+        calls = []
+
+        async def slow_telemetry():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"metrics": {"host.cpu.pct_total": 5}}
+
+        telemetry._current_metrics_cache.update(data=None, expires_at=0.0)
+        with patch.object(telemetry.agent_client, "get_current_telemetry", side_effect=slow_telemetry):
+            first, second = await asyncio.gather(
+                telemetry.get_current_metrics({}), telemetry.get_current_metrics({})
+            )
+            cached = await telemetry.get_current_metrics({})
+
+        assert first is second is cached
+        assert len(calls) == 1
+
+
+class TestMetricStreaming:
+    """Test streamed metric series responses."""
+
+    @pytest.mark.asyncio
+    async def test_series_stream_keeps_request_order_and_empty_metrics(self):
+        import json
+        import sqlite3
+        from unittest.mock import AsyncMock, patch
+
+        import routers.telemetry as telemetry
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE metrics_raw (metric TEXT, ts INTEGER, value REAL)")
+        conn.executemany(
+            "INSERT INTO metrics_raw VALUES (?, ?, ?)",
+            [("host.cpu.pct_total", ts, 1.5) for ts in range(1, 2501)] + [("host.mem.pct", 7, 40.0)],
+        )
+
+        class _Cursor:
+            def __init__(self, sql, params):
+                self._cursor = conn.execute(sql, params)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def fetchmany(self, size):
+                return self._cursor.fetchmany(size)
+
+        database = type("Db", (), {"execute": lambda self, sql, params: _Cursor(sql, params)})()
+        with patch.object(telemetry, "get_telemetry_db", AsyncMock(return_value=database)):
+            response = await telemetry.query_metrics(
+                "host.mem.pct,host.cpu.pct_total,host.temp.cpu_c,host.mem.pct", 1, 10_000, 1, {}
+            )
+            body = b"".join([chunk async for chunk in response.body_iterator])
+
+        series = json.loads(body)
+        assert [item["metric"] for item in series] == [
+            "host.mem.pct", "host.cpu.pct_total", "host.temp.cpu_c", "host.mem.pct",
+        ]
+        assert series[0]["points"] == series[3]["points"] == [{"ts": 7, "value": 40.0}]
+        assert len(series[1]["points"]) == 2500
+        assert series[2]["points"] == []
+
+
+class TestDashboardCounts:
+    """Test the cached dashboard aggregation."""
+
+    @pytest.mark.asyncio
+    async def test_counts_are_cached_until_invalidated(self):
+        from unittest.mock import AsyncMock, patch
+
+        import services.dashboard_counts as module
+
+        counts = module.DashboardCounts(ttl=60)
+        load = AsyncMock(side_effect=[({"APP": 1}, {}), ({"APP": 2}, {})])
+        with patch.object(counts, "_load", load):
+            first = await counts.get()
+            assert await counts.get() is first
+            counts.invalidate()
+            second = await counts.get()
+
+        assert load.await_count == 2
+        assert second == ({"APP": 2}, {})
+
+
+class TestDashboardEtag:
+    """Test conditional dashboard responses."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_dashboard_returns_304(self):
+        from unittest.mock import AsyncMock, patch
+
+        from starlette.requests import Request
+
+        import routers.telemetry as telemetry
+
+        def request(etag=None):
+            headers = [(b"if-none-match", etag.encode())] if etag else []
+            return Request({"type": "http", "headers": headers})
+
+        with patch.object(telemetry.telemetry_collector, "get_last_metrics", return_value={"host.cpu.pct_total": 3}), \
+                patch.object(telemetry.dashboard_counts, "get", AsyncMock(return_value=({}, {}))):
+            first = await telemetry.get_dashboard_data(request(), {})
+            second = await telemetry.get_dashboard_data(request(first.headers["etag"]), {})
+
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "private, max-age=2"
+        assert second.status_code == 304
+        assert second.body == b""
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -59,6 +59,56 @@ class TestBreakGlassTokens:
         hash2 = hash_token("token2")
         
         assert hash1 != hash2
+    
+    @pytest.mark.asyncio
+    async def test_validation_is_cached_until_session_closes(self):
+        """A validated token skips the database until its session is closed."""
+        from datetime import timedelta
+        from unittest.mock import AsyncMock, MagicMock, patch
+        import routers.terminal as terminal
+        
+        expires_at = (terminal.utc_now() + timedelta(minutes=5)).isoformat()
+        cursor = MagicMock(fetchone=AsyncMock(return_value=(1, expires_at, None)))
+        database = MagicMock(execute=AsyncMock(return_value=cursor), commit=AsyncMock())
+        with patch.object(terminal, "get_control_db", AsyncMock(return_value=database)):
+            assert await terminal.validate_breakglass_token("cached-token", 7)
+            assert await terminal.validate_breakglass_token("cached-token", 7)
+            assert not await terminal.validate_breakglass_token("cached-token", 8)
+            assert database.execute.await_count == 1
+            
+            await terminal.close_breakglass_session(7)
+            cursor.fetchone.return_value = None
+            assert not await terminal.validate_breakglass_token("cached-token", 7)
+    
+    @pytest.mark.asyncio
+    async def test_close_during_validation_is_not_cached_over(self):
+        """A validation that read the row before a close does not cache it."""
+        import asyncio
+        from datetime import timedelta
+        from unittest.mock import AsyncMock, MagicMock, patch
+        import routers.terminal as terminal
+        
+        expires_at = (terminal.utc_now() + timedelta(minutes=5)).isoformat()
+        row_read = asyncio.Event()
+        release = asyncio.Event()
+        
+        async def fetchone():
+            row_read.set()
+            await release.wait()
+            return (1, expires_at, None)
+        
+        cursor = MagicMock(fetchone=fetchone)
+        database = MagicMock(execute=AsyncMock(return_value=cursor), commit=AsyncMock())
+        with patch.object(terminal, "get_control_db", AsyncMock(return_value=database)):
+            validation = asyncio.create_task(
+                terminal.validate_breakglass_token("racing-token", 9)
+            )
+            await row_read.wait()
+            await terminal.close_breakglass_session(9)
+            release.set()
+            assert await validation
+        
+        assert terminal.hash_token("racing-token") not in terminal._breakglass_cache
 
 
 class TestRestrictedCommandValidation:
@@ -190,6 +240,114 @@ class TestSecurityConfiguration:
         assert settings.terminal_max_message_size <= 65536  # Reasonable max
 
 
+class TestTerminalSessionOutput:
+    """Test PTY output delivery for full-mode sessions."""
+    
+    @pytest.mark.asyncio
+    async def test_output_is_broadcast_until_eof(self):
+        """Readable output reaches every WebSocket; EOF stops the session."""
+        import asyncio
+        from routers.terminal import TerminalSession
+        
+        class FakeWebSocket:
+            def __init__(self):
+                self.received = []
+            
+            async def send(self, message):
+                self.received.append(message["bytes"])
+        
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        session = TerminalSession("test-session", 1, "tester")
+        session.fd = read_fd
+        session.running = True
+        session._record_history(b"earlier ")
+        websocket = FakeWebSocket()
+        await session.connect(websocket)
+        sender = session._senders[websocket]
+        
+        session._start_reader()
+        os.write(write_fd, b"hello")
+        os.close(write_fd)
+        await asyncio.wait_for(session.read_task, timeout=1)
+        await asyncio.wait_for(sender, timeout=1)
+        
+        assert b"".join(websocket.received) == b"earlier hello"
+        assert not session.running
+        assert session.fd is None
+
+    @pytest.mark.asyncio
+    async def test_ready_frame_follows_history_through_the_sender(self):
+        """The ready signal is queued after the replay, not sent alongside it."""
+        import asyncio
+        import json
+        from routers.terminal import TerminalSession
+
+        class FakeWebSocket:
+            def __init__(self):
+                self.received = []
+
+            async def send(self, message):
+                self.received.append(message)
+
+        session = TerminalSession("test-session", 1, "tester")
+        session._record_history(b"earlier")
+        websocket = FakeWebSocket()
+        await session.connect(websocket, ready={"status": "connected"})
+        sender = session._senders[websocket]
+        session.subscribers[websocket].put_nowait(None)
+        await asyncio.wait_for(sender, timeout=1)
+
+        assert [m.get("bytes") or json.loads(m["text"]) for m in websocket.received] == [
+            b"earlier",
+            {"status": "connected"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_idle_session_times_out(self):
+        """The idle timer closes a session once its deadline passes."""
+        import asyncio
+        from routers.terminal import IDLE_TIMEOUT_MESSAGE, TerminalSession
+
+        class FakeWebSocket:
+            def __init__(self):
+                self.received = []
+
+            async def send(self, message):
+                self.received.append(message["bytes"])
+
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        session = TerminalSession("test-session", 1, "tester")
+        session.fd = read_fd
+        session.running = True
+        session.idle_timeout = 0.05
+        websocket = FakeWebSocket()
+        await session.connect(websocket)
+        sender = session._senders[websocket]
+
+        session._start_reader()
+        await asyncio.wait_for(session.read_task, timeout=1)
+        await asyncio.wait_for(sender, timeout=1)
+        os.close(write_fd)
+
+        assert websocket.received == [IDLE_TIMEOUT_MESSAGE]
+        assert not session.running
+        assert session._idle_handle is None
+
+    def test_history_keeps_latest_bytes(self):
+        """History wraps at capacity and replays oldest first."""
+        from routers.terminal import HISTORY_CAPACITY, TerminalSession
+        
+        session = TerminalSession("test-session", 1, "tester")
+        session._record_history(b"a" * (HISTORY_CAPACITY - 2))
+        session._record_history(b"bcde")
+        
+        history = session.history()
+        assert len(history) == HISTORY_CAPACITY
+        assert history.endswith(b"abcde")
+        assert history.startswith(b"aa")
+
 class TestAuditLogging:
     """Test audit logging functionality."""
     
@@ -199,6 +357,21 @@ class TestAuditLogging:
         # This would require mocking the database
         # Placeholder for integration test
         pass
+    
+    @pytest.mark.asyncio
+    async def test_routine_events_are_batched(self):
+        """Routine events go to the batch writer; break-glass events commit at once."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+        import routers.terminal as terminal
+        
+        database = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+        with patch.object(terminal.audit_writer, "enqueue") as enqueue, \
+                patch.object(terminal, "get_control_db", AsyncMock(return_value=database)):
+            await terminal.log_terminal_event("restricted_command_exec", 1, details="uptime")
+            await terminal.log_terminal_event("breakglass_open", 1)
+        
+        enqueue.assert_called_once_with(1, "restricted_command_exec", None, "uptime", None)
+        database.commit.assert_awaited_once()
 
 
 class TestSecurityScenarios:
@@ -124,14 +124,9 @@ export default function Terminal() {
             if (fitAddonRef.current) {
                 fitAddonRef.current.fit()
 
-                // Send resize to server
+                // Send resize to server as "R\t<cols>\t<rows>"
                 if (wsRef.current?.readyState === WebSocket.OPEN) {
-                    wsRef.current.send(JSON.stringify({
-                        resize: {
-                            cols: term.cols,
-                            rows: term.rows
-                        }
-                    }))
+                    wsRef.current.send(`R\t${term.cols}\t${term.rows}`)
                 }
             }
         }
@@ -278,10 +273,11 @@ export default function Terminal() {
         shouldReconnectRef.current = true
         reconnectAttemptsRef.current = 0
 
-        // Send terminal input to server (for full PTY mode)
+        // Send terminal input to server (for full PTY mode) as binary frames;
+        // text frames are reserved for control messages
         term.onData((data) => {
             if (ws.readyState === WebSocket.OPEN) {
-                ws.send(data)
+                ws.send(new TextEncoder().encode(data))
             }
         })
     }
@@ -361,7 +357,7 @@ export default function Terminal() {
         }
 
         term.onData((data) => {
-            if (ws.readyState === WebSocket.OPEN) ws.send(data)
+            if (ws.readyState === WebSocket.OPEN) ws.send(new TextEncoder().encode(data))
         })
     }
 